@@ -0,0 +1,103 @@
+import math
+import time
+
+from cache import TTLCache, MISS
+
+
+def parse_rate(value):
+    # "30/60" -> 30 keres 60 masodpercenkent, egyszerre max 30 (burst)
+    count, _, period = str(value).partition('/')
+    count = float(count)
+    period = float(period or 1)
+    if count <= 0 or period <= 0:
+        raise ValueError(f"Érvénytelen limit: {value}")
+    return count / period, count
+
+
+class TokenBucket:
+    __slots__ = ('rate', 'burst', 'tokens', 'updated_at')
+
+    def __init__(self, rate, burst, now):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = now
+
+    def refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self):
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+class AdmissionControl:
+    # route-onkenti token bucketek user es guild szerint, plusz globalis load shedding,
+    # ha tul sok a parhuzamos keres vagy az event loop mar kesik
+
+    def __init__(self, limits, max_in_flight=0, max_loop_lag=0.0, maxsize=100000):
+        # limits: route -> {'user': (rate, burst), 'guild': (rate, burst)}
+        self.limits = limits
+        self.max_in_flight = max_in_flight
+        self.max_loop_lag = max_loop_lag
+        # a tele bucket ugyanaz, mint a hianyzo, igy a feltoltesi ido utan eldobhato
+        refill_time = max((burst / rate for route in limits.values() for rate, burst in route.values()), default=60)
+        self.buckets = TTLCache(maxsize=maxsize, ttl=refill_time)
+
+        self.admitted = 0
+        self.rejected = {}
+
+    def shed(self, in_flight, loop_lag):
+        # -> (reason, retry_after) vagy None
+        if self.max_loop_lag and loop_lag > self.max_loop_lag:
+            return 'loop_lag', max(1, math.ceil(loop_lag))
+        if self.max_in_flight and in_flight > self.max_in_flight:
+            return 'in_flight', 1
+        return None
+
+    def get_bucket(self, key, rate, burst, now):
+        bucket = self.buckets.get(key)
+        if bucket is MISS:
+            bucket = TokenBucket(rate, burst, now)
+        else:
+            bucket.refill(now)
+
+        # a lejarat az utolso hasznalattol szamit
+        self.buckets.set(key, bucket)
+        return bucket
+
+    def check(self, route, user_id, guild_id=None):
+        # -> (reason, retry_after) vagy None; csak akkor vonunk le tokent, ha minden bucket enged
+        limits = self.limits.get(route)
+        if not limits:
+            return None
+
+        now = time.monotonic()
+        buckets = []
+
+        if user_id is not None and 'user' in limits:
+            buckets.append(('user', self.get_bucket((route, 'user', user_id), *limits['user'], now)))
+        if guild_id is not None and 'guild' in limits:
+            buckets.append(('guild', self.get_bucket((route, 'guild', guild_id), *limits['guild'], now)))
+
+        for reason, bucket in buckets:
+            wait = bucket.wait_time()
+            if wait > 0:
+                return reason, max(1, math.ceil(wait))
+
+        for _, bucket in buckets:
+            bucket.tokens -= 1
+
+        self.admitted += 1
+        return None
+
+    def record_rejection(self, reason):
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+
+    def stats(self):
+        return {
+            'buckets': len(self.buckets),
+            'admitted': self.admitted,
+            'rejected': sum(self.rejected.values()),
+            **{f'rejected_{reason}': count for reason, count in self.rejected.items()}
+        }
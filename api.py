@@ -2,9 +2,16 @@ from sanic import Sanic, response
 from sanic_cors import CORS
 import sys
 import os
+import asyncio
+import json
+import hashlib
+import time
+import hmac
+import re
+import tempfile
+import functools
 from pathlib import Path
 from dotenv import load_dotenv
-import aiohttp
 from urllib.parse import urlencode
 
 load_dotenv()
@@ -12,11 +19,41 @@ load_dotenv()
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from common.database import DatabaseManager
+from discord_http import DiscordClient, DiscordError
+from db_async import AsyncDatabase
+from cache import TTLCache, MISS
+from presence import BotPresence
+from audit import AuditLog
+from guild_config import GuildConfigCache
+from guild_sync import GuildSync
+from permissions import PermissionIndex
+from static_assets import StaticAssets
+from jobs import JobStore, JobQueue
+from singleflight import SingleFlight
+from templates import TemplateStore, TemplateCache
+from validation import validate_embed, validate_dropdown, select_limit
+from bus import InvalidationBus
+from admission import AdmissionControl, parse_rate
+import metrics
+import profiling
 
 app = Sanic("discord_config_api")
 CORS(app, supports_credentials=True)
 
-db = DatabaseManager(
+# tobb worker eseten minden processznek sajat cache-e van, a valtozasokat a buszon kuldjuk at
+API_WORKERS = int(os.getenv('API_WORKERS', '1'))
+# telepitesenkent (user + kod helye) kulon konyvtar, hogy ket peldany ne lassa egymas socketjeit
+INVALIDATION_BUS_DIR = os.getenv('INVALIDATION_BUS_DIR') or os.path.join(
+    os.getenv('XDG_RUNTIME_DIR') or tempfile.gettempdir(),
+    f"discord_config_api_{os.getuid()}_{hashlib.sha1(os.path.dirname(os.path.abspath(__file__)).encode()).hexdigest()[:12]}"
+)
+
+bus = InvalidationBus(INVALIDATION_BUS_DIR)
+
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '10'))
+DB_QUERY_TIMEOUT = float(os.getenv('DB_QUERY_TIMEOUT', '10'))
+
+database = DatabaseManager(
     dbname=os.getenv('DB_NAME'),
     user=os.getenv('DB_USER'),
     password=os.getenv('DB_PASSWORD'),
@@ -24,28 +61,698 @@ db = DatabaseManager(
     port=os.getenv('DB_PORT')
 )
 
+def observe_db_call(name, duration, outcome):
+    metrics.observe_db_call(name, duration, outcome)
+    profiling.record_span('db', name, duration)
+
+def observe_discord_request(route, status, duration):
+    metrics.observe_discord_request(route, status, duration)
+    profiling.record_span('discord', route, duration)
+
+db = AsyncDatabase(database, pool_size=DB_POOL_SIZE, timeout=DB_QUERY_TIMEOUT)
+db.observer = observe_db_call
+
+# azonos, egyszerre futo olvasasok (Discord es DB) osszevonasa
+singleflight = SingleFlight()
+
+SESSION_CACHE_SIZE = int(os.getenv('SESSION_CACHE_SIZE', '10000'))
+SESSION_CACHE_TTL = float(os.getenv('SESSION_CACHE_TTL', '60'))
+SESSION_CACHE_NEGATIVE_TTL = float(os.getenv('SESSION_CACHE_NEGATIVE_TTL', '10'))
+
+session_cache = TTLCache(
+    maxsize=SESSION_CACHE_SIZE,
+    ttl=SESSION_CACHE_TTL,
+    negative_ttl=SESSION_CACHE_NEGATIVE_TTL
+)
+
+CHANNEL_CACHE_SIZE = int(os.getenv('CHANNEL_CACHE_SIZE', '2000'))
+CHANNEL_CACHE_TTL = float(os.getenv('CHANNEL_CACHE_TTL', '120'))
+
+channel_cache = TTLCache(maxsize=CHANNEL_CACHE_SIZE, ttl=CHANNEL_CACHE_TTL)
+# guildenkent no minden csatorna valtozasnal, igy egy kozben indult lekeres nem irja felul az ujabb allapotot
+channel_generations = {}
+
+CONFIG_CACHE_SIZE = int(os.getenv('CONFIG_CACHE_SIZE', '5000'))
+CONFIG_CACHE_TTL = float(os.getenv('CONFIG_CACHE_TTL', '600'))
+
+config_cache = GuildConfigCache(db, singleflight, maxsize=CONFIG_CACHE_SIZE, ttl=CONFIG_CACHE_TTL)
+
+PERMISSION_INDEX_SIZE = int(os.getenv('PERMISSION_INDEX_SIZE', '20000'))
+PERMISSION_INDEX_TTL = float(os.getenv('PERMISSION_INDEX_TTL', '900'))
+
+permission_index = PermissionIndex(db, singleflight, maxsize=PERMISSION_INDEX_SIZE, ttl=PERMISSION_INDEX_TTL)
+
+def guilds_synced(user_id):
+    permission_index.invalidate(user_id)
+    bus.publish('guilds_synced', user_id)
+
+guild_sync = GuildSync(db, on_synced=guilds_synced)
+
+AUDIT_QUEUE_SIZE = int(os.getenv('AUDIT_QUEUE_SIZE', '10000'))
+AUDIT_BATCH_SIZE = int(os.getenv('AUDIT_BATCH_SIZE', '100'))
+AUDIT_FLUSH_INTERVAL = float(os.getenv('AUDIT_FLUSH_INTERVAL', '1'))
+
+INTERNAL_EVENT_TOKEN = os.getenv('INTERNAL_EVENT_TOKEN')
+INTERNAL_EVENT_MAX_BATCH = int(os.getenv('INTERNAL_EVENT_MAX_BATCH', '1000'))
+
+# mar feldolgozott bot event ID-k, hogy az ujrakuldes ne fusson le ketszer
+seen_events = TTLCache(maxsize=100000, ttl=3600)
+
+# tartos allapot, ezert alapbol a user state konyvtaraba kerul, nem a kod melle
+JOB_DB_PATH = os.getenv('JOB_DB_PATH') or os.path.join(
+    os.getenv('XDG_STATE_HOME') or os.path.expanduser('~/.local/state'), 'discord_config_api', 'outbound_jobs.sqlite3'
+)
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '4'))
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '5'))
+# masodperc; ennyi ido utan toroljuk a kesz (sent/failed) jobokat, 0 = soha
+JOB_RETENTION = float(os.getenv('JOB_RETENTION', str(7 * 86400)))
+
+# a kimeno uzenetek sora; az SQLite kapcsolatot egyetlen szal hasznalja
+os.makedirs(os.path.dirname(os.path.abspath(JOB_DB_PATH)), exist_ok=True)
+job_store = AsyncDatabase(JobStore(JOB_DB_PATH), pool_size=1, timeout=DB_QUERY_TIMEOUT)
+
+TEMPLATE_CACHE_SIZE = int(os.getenv('TEMPLATE_CACHE_SIZE', '2000'))
+TEMPLATE_CACHE_TTL = float(os.getenv('TEMPLATE_CACHE_TTL', '600'))
+TEMPLATE_MAX_PER_GUILD = int(os.getenv('TEMPLATE_MAX_PER_GUILD', '50'))
+TEMPLATE_NAME_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+# a sablonok ugyanabban az SQLite fajlban vannak, mint a job queue, kulon kapcsolattal
+template_store = AsyncDatabase(TemplateStore(JOB_DB_PATH), pool_size=1, timeout=DB_QUERY_TIMEOUT)
+templates = TemplateCache(template_store, singleflight, maxsize=TEMPLATE_CACHE_SIZE, ttl=TEMPLATE_CACHE_TTL)
+
+BULK_SEND_MAX_TARGETS = int(os.getenv('BULK_SEND_MAX_TARGETS', '50'))
+BULK_SEND_CONCURRENCY = int(os.getenv('BULK_SEND_CONCURRENCY', '5'))
+
+# route template -> {"user": "keres/masodperc", "guild": "keres/masodperc"}; az ADMISSION_LIMITS (JSON) felulirja
+ADMISSION_LIMITS = {
+    '/api/embed/send': {'user': '20/60', 'guild': '60/60'},
+    '/api/dropdown/send': {'user': '20/60', 'guild': '60/60'},
+    '/api/send/bulk': {'user': '5/60', 'guild': '10/60'},
+    '/api/channels/<guild_id>': {'user': '60/60', 'guild': '120/60'}
+}
+ADMISSION_LIMITS.update(json.loads(os.getenv('ADMISSION_LIMITS', '{}')))
+ADMISSION_ENABLED = os.getenv('ADMISSION_ENABLED', '1').lower() not in ('0', 'false', 'no')
+ADMISSION_MAX_IN_FLIGHT = int(os.getenv('ADMISSION_MAX_IN_FLIGHT', '500'))
+ADMISSION_MAX_LOOP_LAG = float(os.getenv('ADMISSION_MAX_LOOP_LAG', '0.5'))
+ADMISSION_EXEMPT_ROUTES = ('/health', '/metrics', '/internal/events', '/admin/profile', '/admin/traces')
+
+admission = AdmissionControl(
+    {
+        route: {scope: parse_rate(rate) for scope, rate in limits.items()}
+        for route, limits in ADMISSION_LIMITS.items()
+    },
+    max_in_flight=ADMISSION_MAX_IN_FLIGHT,
+    max_loop_lag=ADMISSION_MAX_LOOP_LAG
+)
+
+ADMIN_USER_IDS = {int(user_id) for user_id in os.getenv('ADMIN_USER_IDS', '').split(',') if user_id.strip()}
+# masodperc; 0 = kikapcsolva, ilyenkor csak az X-Trace headeres requesteknel gyujtunk span-eket
+SLOW_REQUEST_THRESHOLD = float(os.getenv('SLOW_REQUEST_THRESHOLD', '0'))
+PROFILE_MAX_SECONDS = float(os.getenv('PROFILE_MAX_SECONDS', '30'))
+
+slow_requests = profiling.SlowRequestLog(SLOW_REQUEST_THRESHOLD)
+profiler = profiling.SamplingProfiler()
+
 DISCORD_CLIENT_ID = os.getenv('DISCORD_CLIENT_ID')
 DISCORD_CLIENT_SECRET = os.getenv('DISCORD_CLIENT_SECRET')
 DISCORD_REDIRECT_URI = os.getenv('DISCORD_REDIRECT_URI')
 DISCORD_BOT_TOKEN = os.getenv('DISCORD_TOKEN')
-DISCORD_API_ENDPOINT = 'https://discord.com/api/v10'
+DISCORD_API_ENDPOINT = os.getenv('DISCORD_API_ENDPOINT', 'https://discord.com/api/v10')
+
+DISCORD_HTTP_LIMIT = int(os.getenv('DISCORD_HTTP_LIMIT', '100'))
+DISCORD_HTTP_LIMIT_PER_HOST = int(os.getenv('DISCORD_HTTP_LIMIT_PER_HOST', '50'))
+DISCORD_HTTP_DNS_TTL = int(os.getenv('DISCORD_HTTP_DNS_TTL', '300'))
+DISCORD_HTTP_KEEPALIVE = int(os.getenv('DISCORD_HTTP_KEEPALIVE', '60'))
+DISCORD_HTTP_TIMEOUT = int(os.getenv('DISCORD_HTTP_TIMEOUT', '15'))
+DISCORD_GLOBAL_RATE = int(os.getenv('DISCORD_GLOBAL_RATE', '50'))
+DISCORD_MAX_RETRIES = int(os.getenv('DISCORD_MAX_RETRIES', '3'))
+DISCORD_MAX_RETRY_WAIT = float(os.getenv('DISCORD_MAX_RETRY_WAIT', '30'))
+
+BOT_PRESENCE_REFRESH = float(os.getenv('BOT_PRESENCE_REFRESH', '300'))
+# ennyit varunk az elso presence betoltesre, utana bot_in_guild: null
+BOT_PRESENCE_WAIT = float(os.getenv('BOT_PRESENCE_WAIT', '2'))
+
+# a bot token globalis limitje az osszes workerre vonatkozik, ezert workerenkent csak a rank eso
+# reszt hasznaljuk (a route bucketek workerenkent kulon tanulnak, az ebbol adodo 429-eket a retry kezeli)
+DISCORD_WORKER_GLOBAL_RATE = max(1.0, DISCORD_GLOBAL_RATE / API_WORKERS)
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DASHBOARD_DIR = os.path.join(BASE_DIR, "dashboard")
 
-app.static("/static", DASHBOARD_DIR)
+STATIC_RELOAD = os.getenv('STATIC_RELOAD', '').lower() in ('1', 'true', 'yes')
+
+static_assets = StaticAssets(DASHBOARD_DIR, reload=STATIC_RELOAD)
+
+@app.listener("before_server_start")
+async def start_invalidation_bus(app):
+    if API_WORKERS <= 1:
+        return
+
+    bus.subscribe('session', session_cache.invalidate)
+    bus.subscribe('permissions', permission_index.invalidate)
+    bus.subscribe('guilds_synced', on_guilds_synced)
+    bus.subscribe('config_invalidate', config_cache.invalidate)
+    bus.subscribe('channels', forget_guild_channels)
+    bus.subscribe('bot_guild', on_bot_guild)
+    bus.subscribe('presence_refreshed', lambda: app.ctx.bot_presence.load_snapshot())
+    bus.subscribe('template', templates.invalidate)
+    bus.start()
+
+@app.listener("before_server_start")
+async def load_static_assets(app):
+    static_assets.preload()
+
+@app.listener("before_server_start")
+async def setup_discord_client(app):
+    app.ctx.discord = DiscordClient(
+        DISCORD_API_ENDPOINT,
+        DISCORD_BOT_TOKEN,
+        limit=DISCORD_HTTP_LIMIT,
+        limit_per_host=DISCORD_HTTP_LIMIT_PER_HOST,
+        dns_ttl=DISCORD_HTTP_DNS_TTL,
+        keepalive_timeout=DISCORD_HTTP_KEEPALIVE,
+        timeout=DISCORD_HTTP_TIMEOUT,
+        global_rate=DISCORD_WORKER_GLOBAL_RATE,
+        max_retries=DISCORD_MAX_RETRIES,
+        max_retry_wait=DISCORD_MAX_RETRY_WAIT
+    )
+    app.ctx.discord.observer = observe_discord_request
+    await app.ctx.discord.start()
+
+@app.listener("before_server_start")
+async def start_bot_presence(app):
+    # tobb workernel csak egyikuk kerdezi le a bot guildjeit, a tobbiek a bus konyvtaraban levo fajlbol toltik be
+    app.ctx.bot_presence = BotPresence(
+        app.ctx.discord,
+        refresh_interval=BOT_PRESENCE_REFRESH,
+        shared_dir=INVALIDATION_BUS_DIR if API_WORKERS > 1 else None,
+        on_refresh=lambda: bus.publish('presence_refreshed')
+    )
+    app.ctx.bot_presence_task = asyncio.get_running_loop().create_task(app.ctx.bot_presence.run())
+
+@app.listener("before_server_start")
+async def start_audit_log(app):
+    app.ctx.audit = AuditLog(
+        db,
+        max_queue=AUDIT_QUEUE_SIZE,
+        batch_size=AUDIT_BATCH_SIZE,
+        flush_interval=AUDIT_FLUSH_INTERVAL
+    )
+    app.ctx.audit.start()
+
+@app.listener("before_server_start")
+async def start_job_queue(app):
+    app.ctx.jobs = JobQueue(
+        job_store,
+        deliver_job,
+        workers=JOB_WORKERS,
+        max_attempts=JOB_MAX_ATTEMPTS,
+        retention=JOB_RETENTION
+    )
+    app.ctx.jobs.start()
+
+@app.listener("before_server_start")
+async def start_metrics(app):
+    app.ctx.loop_monitor_task = asyncio.get_running_loop().create_task(metrics.monitor_event_loop())
+
+    metrics.stats_collector('db_pool', 'DB thread pool stats', db.stats)
+    metrics.stats_collector('session_cache', 'Session cache stats', session_cache.stats)
+    metrics.stats_collector('channel_cache', 'Channel cache stats', channel_cache.stats)
+    metrics.stats_collector('config_cache', 'Guild config cache stats', config_cache.stats)
+    metrics.stats_collector('discord_scheduler', 'Discord rate limit scheduler stats', app.ctx.discord.stats)
+    metrics.stats_collector('audit_log', 'Audit log queue stats', app.ctx.audit.stats)
+    metrics.stats_collector('bot_presence', 'Bot presence set stats', app.ctx.bot_presence.stats)
+    metrics.stats_collector('guild_sync', 'Background guild sync stats', guild_sync.stats)
+    metrics.stats_collector('singleflight', 'Coalesced read stats', singleflight.stats)
+    metrics.stats_collector('job_queue', 'Outbound job queue stats', app.ctx.jobs.stats)
+    metrics.stats_collector('jobs_by_status', 'Outbound jobs by status (refreshed periodically)', lambda: app.ctx.jobs.status_counts)
+    metrics.stats_collector('permission_index', 'Permission index stats', permission_index.stats)
+    metrics.stats_collector('template_cache', 'Payload template cache stats', templates.stats)
+    metrics.stats_collector('invalidation_bus', 'Cross-worker invalidation bus stats', bus.stats)
+    metrics.stats_collector('admission', 'Admission control stats', admission.stats)
+    metrics.stats_collector('slow_requests', 'Slow request log stats', slow_requests.stats)
+
+@app.listener("before_server_stop")
+async def stop_metrics(app):
+    app.ctx.loop_monitor_task.cancel()
+
+@app.middleware('request')
+async def start_request_timer(request):
+    route = request.route.path if request.route else 'unmatched'
+    request.ctx.route = '/' + route.lstrip('/')
+    request.ctx.started_at = time.monotonic()
+    metrics.current_route.set(request.ctx.route)
+    metrics.http_requests_in_flight.inc()
+
+    # keep-alive kapcsolaton a context a kovetkezo requestre is atmegy, ezert mindig beallitjuk
+    trace = None
+    if SLOW_REQUEST_THRESHOLD or 'x-trace' in request.headers:
+        trace = profiling.Trace(request.method, request.ctx.route, request.path)
+    request.ctx.trace = trace
+    profiling.current_trace.set(trace)
+
+@functools.lru_cache(maxsize=256)
+def admission_route(route):
+    # a Sanic route template-ben a parameter tipusa is benne van: <guild_id:str> -> <guild_id>
+    return re.sub(r'<(\w+):[^>]*>', r'<\1>', route)
+
+def request_guild_id(request):
+    guild_id = request.match_info.get('guild_id')
+
+    if guild_id is None and request.method == 'POST':
+        try:
+            data = request.json
+        except Exception:
+            return None
+        if isinstance(data, dict):
+            guild_id = data.get('guild_id')
+
+    try:
+        return int(guild_id) if guild_id is not None else None
+    except (TypeError, ValueError):
+        return None
+
+@app.middleware('request')
+async def admission_control(request):
+    if not ADMISSION_ENABLED:
+        return
+
+    route = admission_route(request.ctx.route)
+    if route in ADMISSION_EXEMPT_ROUTES:
+        return
+
+    rejected = admission.shed(metrics.http_requests_in_flight.get(), metrics.event_loop_lag_last.get())
+
+    if rejected is None and route in admission.limits:
+        user = await get_user_from_session(get_session_from_request(request))
+        # bejelentkezes nelkul a handler ugyis 401-et ad
+        if user:
+            rejected = admission.check(route, user['user_id'], request_guild_id(request))
+
+    if rejected is None:
+        return
+
+    reason, retry_after = rejected
+    admission.record_rejection(reason)
+    metrics.http_requests_rejected.inc(route, reason)
+
+    if reason in ('user', 'guild'):
+        error, status = 'Túl sok kérés, próbáld újra később', 429
+    else:
+        error, status = 'A szerver túlterhelt, próbáld újra később', 503
+
+    return response.json(
+        {'success': False, 'error': error},
+        status=status,
+        headers={'Retry-After': str(retry_after)}
+    )
+
+@app.middleware('response')
+async def record_request_timer(request, response):
+    started_at = getattr(request.ctx, 'started_at', None)
+    if started_at is None:
+        return
+
+    metrics.http_requests_in_flight.dec()
+    metrics.http_request_duration.observe(
+        time.monotonic() - started_at,
+        request.ctx.route,
+        request.method,
+        str(response.status) if response is not None else 'stream'
+    )
+    request.ctx.started_at = None
+
+    trace = request.ctx.trace
+    if trace is not None:
+        trace.finish(time.monotonic() - started_at)
+        slow_requests.observe(trace)
+
+        if response is not None and 'x-trace' in request.headers and await get_admin_user(request):
+            response.headers['Server-Timing'] = trace.server_timing()
+
+@app.listener("before_server_stop")
+async def finish_guild_syncs(app):
+    await guild_sync.drain()
+
+@app.listener("before_server_stop")
+async def flush_audit_log(app):
+    await app.ctx.audit.close()
+
+@app.listener("before_server_stop")
+async def stop_job_queue(app):
+    # a stop listenerek forditott sorrendben futnak: ez meg az audit flush elott
+    await app.ctx.jobs.stop()
+
+@app.listener("before_server_stop")
+async def stop_bot_presence(app):
+    app.ctx.bot_presence_task.cancel()
+    app.ctx.bot_presence.close()
+
+@app.listener("before_server_stop")
+async def close_invalidation_bus(app):
+    bus.close()
+
+@app.listener("after_server_stop")
+async def close_discord_client(app):
+    await app.ctx.discord.close()
+
+@app.listener("after_server_stop")
+async def close_database_pool(app):
+    db.close()
+    job_store.close()
+    template_store.close()
 
 def get_session_from_request(request):
     return request.cookies.get('session_id')
 
-def get_user_from_session(session_id):
+async def get_user_from_session(session_id):
     if not session_id:
         return None
-    return db.get_session(session_id)
+
+    with profiling.span('session'):
+        user = session_cache.get(session_id)
+        if user is not MISS:
+            return user
+
+        # az ismeretlen session_id-t is eltaroljuk (None), rovidebb ideig
+        user = await db.get_session(session_id)
+        session_cache.set(session_id, user)
+        return user
+
+async def has_guild_permission(user_id, guild_id):
+    with profiling.span('permission', str(guild_id)):
+        # ha eppen fut a user guild szinkronja, megvarjuk, kulonben regi jogokat latnank
+        await guild_sync.wait(user_id)
+        return await permission_index.check(user_id, guild_id)
+
+async def get_admin_user(request):
+    if not ADMIN_USER_IDS:
+        return None
+
+    user = await get_user_from_session(get_session_from_request(request))
+    if user and user['user_id'] in ADMIN_USER_IDS:
+        return user
+    return None
+
+def discord_error_response(resp, error):
+    # ha a retry-ok utan is 429 maradt, azt adjuk tovabb, ne 500-at
+    if resp.status == 429:
+        retry_after = resp.headers.get('Retry-After', '1')
+        return response.json(
+            {'success': False, 'error': 'Discord rate limit, próbáld újra később'},
+            status=429,
+            headers={'Retry-After': retry_after}
+        )
+    return response.json({'success': False, 'error': error}, status=500)
+
+def validation_error_response(errors):
+    first = errors[0]
+    return response.json({
+        'success': False,
+        'error': first['error'] if first['field'] in ('$', 'options') else f"{first['field']}: {first['error']}",
+        'details': errors
+    }, status=400)
+
+def etag_matches(request, etag):
+    if_none_match = request.headers.get('if-none-match')
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    return etag in [tag.strip() for tag in if_none_match.split(',')]
+
+def make_channel_entry(text_channels):
+    body = json.dumps({'success': True, 'channels': text_channels}, ensure_ascii=False).encode('utf-8')
+    return {
+        'channels': text_channels,
+        'body': body,
+        'etag': f'"{hashlib.sha1(body).hexdigest()}"'
+    }
+
+def filter_text_channels(channels):
+    # csak text_channelek
+
+    text_channels = []
+
+    for channel in channels:
+        if channel['type'] in [0, 5]:
+            text_channels.append({
+                'id': str(channel['id']),
+                'name': channel['name'],
+                'type': channel['type'],
+                'position': channel.get('position', 0),
+                'parent_id': str(channel.get('parent_id')) if channel.get('parent_id') else None
+            })
+    
+    # a szerveren lévő pozicio alapjan rendezzuk oket.
+
+    text_channels.sort(key=lambda x: x['position'])
+
+    return text_channels
+
+async def fetch_guild_channels(guild_id):
+    generation = channel_generations.get(guild_id, 0)
+
+    resp = await app.ctx.discord.get(f'/guilds/{guild_id}/channels', bot=True)
+    if resp.status != 200:
+        print(f"Channels lekérési hiba: {resp.text}")
+        raise DiscordError(resp)
+
+    entry = make_channel_entry(filter_text_channels(resp.json()))
+    if channel_generations.get(guild_id, 0) == generation:
+        channel_cache.set(guild_id, entry)
+    return entry
+
+async def get_cached_guild_channels(guild_id):
+    entry = channel_cache.get(guild_id)
+    if entry is not MISS:
+        return entry
+
+    # ugyanarra a guildre parhuzamosan erkezo kereseket egy Discord hivasba vonjuk ossze
+    return await singleflight.do(('guild_channels', guild_id), fetch_guild_channels, guild_id)
+
+SNOWFLAKE_PATTERN = re.compile(r'^[0-9]{1,20}$')
+
+def parse_snowflake(value):
+    if isinstance(value, bool) or not isinstance(value, (str, int)) or not SNOWFLAKE_PATTERN.match(str(value)):
+        raise ValueError(f"Érvénytelen ID: {value!r}")
+    return str(value)
+
+async def check_target_channels(guild_id, channel_ids):
+    # a csatornanak a megadott guild szoveges csatornajanak kell lennie, kulonben a bot barmelyik szerverere lehetne kuldeni;
+    # hibanal response-t ad vissza, kulonben None
+    try:
+        entry = await get_cached_guild_channels(guild_id)
+    except DiscordError as e:
+        return discord_error_response(e.response, 'Nem sikerült lekérni a csatornákat')
+
+    known = {channel['id'] for channel in entry['channels']}
+    unknown = [channel_id for channel_id in channel_ids if channel_id not in known]
+
+    if unknown:
+        return response.json({
+            'success': False,
+            'error': 'A csatorna nem ennek a szervernek a szöveges csatornája: ' + ', '.join(f"#{channel_id}" for channel_id in unknown)
+        }, status=400)
+    return None
+
+def bump_guild_channels(guild_id):
+    channel_generations[guild_id] = channel_generations.get(guild_id, 0) + 1
+    singleflight.forget(('guild_channels', guild_id))
+
+def forget_guild_channels(guild_id):
+    bump_guild_channels(guild_id)
+    channel_cache.invalidate(guild_id)
+
+def invalidate_guild_channels(guild_id):
+    forget_guild_channels(int(guild_id))
+    bus.publish('channels', int(guild_id))
+
+def update_cached_channel(guild_id, channel, deleted=False):
+    bump_guild_channels(guild_id)
+
+    # csak a mar cache-ben levo listat frissitjuk, ha nincs bent, a kovetkezo keres ugyis lekeri
+    entry = channel_cache.get(guild_id)
+    if entry is MISS or entry is None:
+        return
+
+    channels = [c for c in entry['channels'] if c['id'] != str(channel['id'])]
+    if not deleted:
+        channels.extend(filter_text_channels([channel]))
+        channels.sort(key=lambda x: x['position'])
+
+    channel_cache.set(guild_id, make_channel_entry(channels))
+
+def on_guilds_synced(user_id):
+    # masik worker irta at a user guildjeit
+    guild_sync.forget(user_id)
+    permission_index.invalidate(user_id)
+
+def on_bot_guild(guild_id, present):
+    # a tobbi worker csak invalidal, a csatornalistat ugyis lekeri, ha kell
+    if present:
+        app.ctx.bot_presence.add(guild_id)
+    else:
+        app.ctx.bot_presence.discard(guild_id)
+    forget_guild_channels(guild_id)
+
+def apply_bot_event(event_type, data):
+    if event_type == 'GUILD_CREATE':
+        guild_id = int(data['id'])
+        app.ctx.bot_presence.add(guild_id)
+        bump_guild_channels(guild_id)
+        if 'channels' in data:
+            channel_cache.set(guild_id, make_channel_entry(filter_text_channels(data['channels'])))
+        bus.publish('bot_guild', guild_id, True)
+        return True
+
+    if event_type == 'GUILD_DELETE':
+        # unavailable = Discord kieses, a bot nem lett kirugva
+        if data.get('unavailable'):
+            return False
+        guild_id = int(data['id'])
+        app.ctx.bot_presence.discard(guild_id)
+        forget_guild_channels(guild_id)
+        bus.publish('bot_guild', guild_id, False)
+        return True
+
+    if event_type in ('CHANNEL_CREATE', 'CHANNEL_UPDATE', 'CHANNEL_DELETE'):
+        if not data.get('guild_id'):
+            return False
+        guild_id = int(data['guild_id'])
+        deleted = event_type == 'CHANNEL_DELETE'
+        update_cached_channel(guild_id, data, deleted)
+        bus.publish('channels', guild_id)
+        return True
+
+    return False
 
 @app.get("/")
 async def index(request):
-    return await response.file(os.path.join(DASHBOARD_DIR, "index.html"))
+    return await static_assets.serve(request, "index.html")
+
+@app.get("/static/<path:path>")
+async def static_file(request, path):
+    return await static_assets.serve(request, path)
+
+@app.get("/health")
+async def health(request):
+    return response.json({
+        'success': True,
+        'db_pool': db.stats(),
+        'session_cache': session_cache.stats(),
+        'bot_presence': app.ctx.bot_presence.stats(),
+        'channel_cache': channel_cache.stats(),
+        'discord': app.ctx.discord.stats(),
+        'audit_log': app.ctx.audit.stats(),
+        'config_cache': config_cache.stats(),
+        'guild_sync': guild_sync.stats(),
+        'permission_index': permission_index.stats(),
+        'template_cache': templates.stats(),
+        'invalidation_bus': bus.stats(),
+        'admission': admission.stats(),
+        'slow_requests': slow_requests.stats(),
+        'profiler': profiler.stats(),
+        'static_assets': static_assets.stats(),
+        'job_queue': app.ctx.jobs.stats(),
+        'jobs_by_status': app.ctx.jobs.status_counts,
+        'singleflight': singleflight.stats()
+    })
+
+@app.post("/internal/events")
+async def ingest_bot_events(request):
+    token = request.headers.get('x-internal-token', '')
+    if not INTERNAL_EVENT_TOKEN or not hmac.compare_digest(token, INTERNAL_EVENT_TOKEN):
+        return response.json({'success': False, 'error': 'Nincs jogosultság'}, status=403)
+
+    data = request.json
+    events = data.get('events') if isinstance(data, dict) else data
+
+    if not isinstance(events, list):
+        return response.json({'success': False, 'error': 'Hiányzó events lista'}, status=400)
+
+    if len(events) > INTERNAL_EVENT_MAX_BATCH:
+        return response.json({'success': False, 'error': f'Maximum {INTERNAL_EVENT_MAX_BATCH} event lehet'}, status=400)
+
+    applied = duplicates = ignored = 0
+
+    for event in events:
+        if not isinstance(event, dict):
+            ignored += 1
+            continue
+
+        event_id = event.get('id')
+        if not isinstance(event_id, (str, int)):
+            event_id = None
+
+        if event_id is not None and seen_events.get(event_id) is not MISS:
+            duplicates += 1
+            continue
+
+        data = event.get('data') or {}
+        if not isinstance(data, dict):
+            ignored += 1
+            continue
+
+        try:
+            if apply_bot_event(event.get('type'), data):
+                applied += 1
+            else:
+                ignored += 1
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            print(f"❌ Hibás bot event ({event.get('type')}): {e}")
+            ignored += 1
+
+        if event_id is not None:
+            seen_events.set(event_id, True)
+
+    return response.json({'success': True, 'applied': applied, 'duplicates': duplicates, 'ignored': ignored})
+
+@app.get("/admin/profile")
+async def admin_profile(request):
+    user = await get_admin_user(request)
+    if not user:
+        return response.json({'success': False, 'error': 'Nincs jogosultság'}, status=403)
+
+    try:
+        seconds = float(request.args.get('seconds', '10'))
+        interval = float(request.args.get('interval', '0.005'))
+    except ValueError:
+        return response.json({'success': False, 'error': 'Érvénytelen paraméter'}, status=400)
+
+    if not 0 < seconds <= PROFILE_MAX_SECONDS:
+        return response.json({'success': False, 'error': f'A seconds 0 és {PROFILE_MAX_SECONDS:g} között lehet'}, status=400)
+
+    print(f"🔍 Profilozás indítva ({seconds:g}s) - user {user['user_id']}")
+
+    try:
+        output, samples = await profiler.profile(
+            seconds,
+            interval=min(max(interval, 0.001), 1.0),
+            all_threads=request.args.get('threads') == 'all'
+        )
+    except RuntimeError as e:
+        return response.json({'success': False, 'error': str(e)}, status=409)
+
+    return response.text(output, headers={
+        'Content-Disposition': f'attachment; filename="profile-{int(time.time())}.folded"',
+        'X-Profile-Samples': str(samples)
+    })
+
+@app.get("/admin/traces")
+async def admin_traces(request):
+    if not await get_admin_user(request):
+        return response.json({'success': False, 'error': 'Nincs jogosultság'}, status=403)
+
+    return response.json({
+        'success': True,
+        'threshold': SLOW_REQUEST_THRESHOLD,
+        'traces': [trace.to_dict() for trace in reversed(slow_requests.recent)]
+    })
+
+@app.get("/metrics")
+async def metrics_endpoint(request):
+    return response.text(metrics.registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
 @app.get("/invite")
 async def invite_bot(request):
@@ -72,66 +779,85 @@ async def auth_callback(request):
     if not code:
         return response.html("<h1>❌ Hiba: Hiányzó authorization code</h1>", status=400)
     
-    async with aiohttp.ClientSession() as session:
-        data = {
-            'client_id': DISCORD_CLIENT_ID,
-            'client_secret': DISCORD_CLIENT_SECRET,
-            'grant_type': 'authorization_code',
-            'code': code,
-            'redirect_uri': DISCORD_REDIRECT_URI
-        }
-        
-        headers = {
-            'Content-Type': 'application/x-www-form-urlencoded'
-        }
-        
-        async with session.post(f'{DISCORD_API_ENDPOINT}/oauth2/token', data=data, headers=headers) as resp:
-            if resp.status != 200:
-                error_text = await resp.text()
-                print(f"❌ Token exchange hiba: {error_text}")
-                return response.html(f"<h1>❌ Authentication hiba</h1><p>{error_text}</p>", status=400)
-            
-            token_data = await resp.json()
-        
-        auth_header = {
-            'Authorization': f"{token_data['token_type']} {token_data['access_token']}"
-        }
-        
-        async with session.get(f'{DISCORD_API_ENDPOINT}/users/@me', headers=auth_header) as resp:
-            if resp.status != 200:
-                return response.html("<h1>❌ Nem sikerült lekérni a user adatokat</h1>", status=400)
-            user_data = await resp.json()
-        
-        async with session.get(f'{DISCORD_API_ENDPOINT}/users/@me/guilds', headers=auth_header) as resp:
-            if resp.status != 200:
-                guilds_data = []
-            else:
-                guilds_data = await resp.json()
-        
-        session_id = db.create_session(user_data, token_data)
-        
-        if not session_id:
-            return response.html("<h1>❌ Nem sikerült létrehozni a session-t</h1>", status=500)
-        
-        db.sync_user_guilds(int(user_data['id']), guilds_data)
-        
-        resp = response.redirect('/dashboard')
-        resp.add_cookie(
-            'session_id',
-            session_id,
-            httponly=True,
-            samesite='Lax',
-            max_age=604800
-        )
-        
-        return resp
+    discord = app.ctx.discord
+
+    data = {
+        'client_id': DISCORD_CLIENT_ID,
+        'client_secret': DISCORD_CLIENT_SECRET,
+        'grant_type': 'authorization_code',
+        'code': code,
+        'redirect_uri': DISCORD_REDIRECT_URI
+    }
+    
+    headers = {
+        'Content-Type': 'application/x-www-form-urlencoded'
+    }
+    
+    resp = await discord.post('/oauth2/token', data=data, headers=headers)
+    if resp.status != 200:
+        error_text = resp.text
+        print(f"❌ Token exchange hiba: {error_text}")
+        return response.html(f"<h1>❌ Authentication hiba</h1><p>{error_text}</p>", status=400)
+    
+    token_data = resp.json()
+    
+    auth_header = {
+        'Authorization': f"{token_data['token_type']} {token_data['access_token']}"
+    }
+    
+    # a ket lekeres fuggetlen egymastol, egyszerre inditjuk oket
+    user_resp, guilds_resp = await asyncio.gather(
+        discord.get('/users/@me', headers=auth_header),
+        discord.get('/users/@me/guilds', headers=auth_header)
+    )
+
+    if user_resp.status != 200:
+        return response.html("<h1>❌ Nem sikerült lekérni a user adatokat</h1>", status=400)
+    user_data = user_resp.json()
+    
+    session_id = await db.create_session(user_data, token_data)
+    
+    if not session_id:
+        return response.html("<h1>❌ Nem sikerült létrehozni a session-t</h1>", status=500)
+    
+    # a guild szinkron a hatterben fut tovabb, a /api/guilds megvarja, ha kell;
+    # sikertelen lekeresnel nem irjuk felul ures listaval a meglevo guildeket
+    if guilds_resp.status == 200:
+        sync_task = guild_sync.start(int(user_data['id']), guilds_resp.json())
+
+        # tobb workernel a kovetkezo keres masik processzbe eshet, ahol a pending task nem latszik,
+        # ezert ilyenkor a redirect elott megvarjuk
+        if API_WORKERS > 1:
+            await asyncio.shield(sync_task)
+    else:
+        print(f"❌ Guild lista lekérési hiba ({guilds_resp.status}): {guilds_resp.text}")
+    
+    resp = response.redirect('/dashboard')
+    resp.add_cookie(
+        'session_id',
+        session_id,
+        httponly=True,
+        samesite='Lax',
+        max_age=604800
+    )
+    
+    return resp
 
 @app.get("/auth/logout")
 async def auth_logout(request):
     session_id = get_session_from_request(request)
     
     if session_id:
-        db.delete_session(session_id)
+        user = await get_user_from_session(session_id)
+        if user:
+            permission_index.invalidate(user['user_id'])
+            bus.publish('permissions', user['user_id'])
+
+        session_cache.invalidate(session_id)
+        await db.delete_session(session_id)
+        # ha kozben egy parhuzamos lookup visszairta volna
+        session_cache.invalidate(session_id)
+        bus.publish('session', session_id)
     
     resp = response.redirect('/')
     resp.add_cookie('session_id', '', max_age=0)
@@ -140,12 +866,12 @@ async def auth_logout(request):
 
 @app.get("/dashboard")
 async def dashboard(request):
-    return await response.file(os.path.join(DASHBOARD_DIR, "dashboard.html"))
+    return await static_assets.serve(request, "dashboard.html")
 
 @app.get("/api/me")
 async def get_current_user(request):
     session_id = get_session_from_request(request)
-    user = get_user_from_session(session_id)
+    user = await get_user_from_session(session_id)
     
     if not user:
         return response.json({'success': False, 'error': 'Nem vagy bejelentkezve'}, status=401)
@@ -163,22 +889,37 @@ async def get_current_user(request):
 @app.get("/api/guilds")
 async def get_guilds(request):
     session_id = get_session_from_request(request)
-    user = get_user_from_session(session_id)
+    user = await get_user_from_session(session_id)
     
     if not user:
         return response.json({'success': False, 'error': 'Nem vagy bejelentkezve'}, status=401)
     
-    guilds = db.get_user_guilds(user['user_id'], manageable_only=True)
+    await guild_sync.wait(user['user_id'])
+    guilds = await singleflight.do(
+        ('user_guilds', user['user_id']),
+        db.get_user_guilds,
+        user['user_id'],
+        manageable_only=True
+    )
+    permission_index.store(user['user_id'], guilds)
     
+    bot_presence = app.ctx.bot_presence
+
+    if await bot_presence.wait_loaded(BOT_PRESENCE_WAIT):
+        bot_status = [bot_presence.contains(g['guild_id']) for g in guilds]
+    else:
+        # hidegindulasnal vagy ha a Discord nem elerheto, guildenkenti DB lekeres helyett "ismeretlen"
+        bot_status = [None] * len(guilds)
+
     guilds_with_bot_status = []
-    for g in guilds:
+    for g, bot_in_guild in zip(guilds, bot_status):
         guild_data = {
             'id': str(g['guild_id']),
             'name': g['guild_name'],
             'icon': g['guild_icon'],
             'owner': g['owner'],
             'permissions': g['permissions'],
-            'bot_in_guild': db.is_bot_in_guild(g['guild_id'])
+            'bot_in_guild': bot_in_guild
         }
         guilds_with_bot_status.append(guild_data)
     
@@ -190,7 +931,7 @@ async def get_guilds(request):
 @app.get("/api/config/<guild_id>")
 async def get_config(request, guild_id):
     session_id = get_session_from_request(request)
-    user = get_user_from_session(session_id)
+    user = await get_user_from_session(session_id)
     
     if not user:
         return response.json({'success': False, 'error': 'Nem vagy bejelentkezve'}, status=401)
@@ -200,15 +941,21 @@ async def get_config(request, guild_id):
     except ValueError:
         return response.json({'success': False, 'error': 'Érvénytelen guild_id'}, status=400)
     
-    if not db.check_user_guild_permission(user['user_id'], guild_id):
+    if not await has_guild_permission(user['user_id'], guild_id):
         return response.json({'success': False, 'error': 'Nincs jogosultságod ehhez a szerverhez'}, status=403)
     
     try:
-        test_message = db.get_test_message(guild_id)
-        if test_message:
-            return response.json({'success': True, 'test_message': test_message})
-        else:
-            return response.json({'success': True, 'test_message': ''})
+        entry = await config_cache.get(guild_id)
+
+        headers = {
+            'ETag': entry['etag'],
+            'Cache-Control': 'private, no-cache'
+        }
+
+        if etag_matches(request, entry['etag']):
+            return response.empty(status=304, headers=headers)
+
+        return response.raw(entry['body'], content_type='application/json', headers=headers)
     except Exception as e:
         print(f"❌ Hiba a config lekérése során: {e}")
         return response.json({'success': False, 'error': str(e)}, status=500)
@@ -216,7 +963,7 @@ async def get_config(request, guild_id):
 @app.post("/api/config/<guild_id>")
 async def save_config(request, guild_id):
     session_id = get_session_from_request(request)
-    user = get_user_from_session(session_id)
+    user = await get_user_from_session(session_id)
     
     if not user:
         return response.json({'success': False, 'error': 'Nem vagy bejelentkezve'}, status=401)
@@ -226,7 +973,7 @@ async def save_config(request, guild_id):
     except ValueError:
         return response.json({'success': False, 'error': 'Érvénytelen guild_id'}, status=400)
     
-    if not db.check_user_guild_permission(user['user_id'], guild_id):
+    if not await has_guild_permission(user['user_id'], guild_id):
         return response.json({'success': False, 'error': 'Nincs jogosultságod ehhez a szerverhez'}, status=403)
     
     try:
@@ -236,10 +983,14 @@ async def save_config(request, guild_id):
         if not test_message:
             return response.json({'success': False, 'error': 'Hiányzó test_message'}, status=400)
         
-        success = db.insert_or_update_message(guild_id, test_message)
+        success = await db.insert_or_update_message(guild_id, test_message)
         
         if success:
-            db.log_action(
+            config_cache.update(guild_id, test_message=test_message)
+            # a buszon csak invalidalunk, a tobbi worker a DB-bol olvassa be az uj erteket
+            bus.publish('config_invalidate', guild_id)
+
+            app.ctx.audit.log(
                 user['user_id'],
                 guild_id,
                 'config_update',
@@ -249,6 +1000,8 @@ async def save_config(request, guild_id):
             
             return response.json({'success': True, 'message': 'Sikeresen mentve'})
         else:
+            config_cache.invalidate(guild_id)
+            bus.publish('config_invalidate', guild_id)
             return response.json({'success': False, 'error': 'Nem sikerült menteni'}, status=500)
             
     except Exception as e:
@@ -258,7 +1011,7 @@ async def save_config(request, guild_id):
 @app.get("/api/channels/<guild_id>")
 async def get_guild_channels(request, guild_id):
     session_id = get_session_from_request(request)
-    user = get_user_from_session(session_id)
+    user = await get_user_from_session(session_id)
 
     if not user:
         return response.json({"success": False, "error": "Nem vagy bejelentkezve!"}, status=401)
@@ -268,53 +1021,144 @@ async def get_guild_channels(request, guild_id):
     except ValueError:
         return response.json({"success": False, "error": "Érvénytelen guild_id"}, status=400)
 
-    if not db.check_user_guild_permission(user['user_id'], guild_id):
+    if not await has_guild_permission(user['user_id'], guild_id):
         return response.json({"success": False, "error": "Nincsen jogod!"}, status=401)
     
     try:
-        async with aiohttp.ClientSession() as session:
-            headers = {
-                'Authorization': f'Bot {DISCORD_BOT_TOKEN}'
-            }
-
-            async with session.get(f'{DISCORD_API_ENDPOINT}/guilds/{guild_id}/channels', headers=headers) as resp:
-                if resp.status != 200:
-                    error_text = await resp.text()
-                    print(f"Channels lekérési hiba: {error_text}")
-                    return response.json({"success": False, "error": "Nem sikerült lekérni a csatornákat!"}, status=500)
-                
-                channels = await resp.json()
-
-                # csak text_channelek
-
-                text_channels = []
-
-                for channel in channels:
-                    if channel['type'] in [0, 5]:
-                        text_channels.append({
-                            'id': str(channel['id']),
-                            'name': channel['name'],
-                            'type': channel['type'],
-                            'position': channel.get('position', 0),
-                            'parent_id': str(channel.get('parent_id')) if channel.get('parent_id') else None
-                        })
-                
-                # a szerveren lévő pozicio alapjan rendezzuk oket.
-
-                text_channels.sort(key=lambda x: x['position'])
-
-                return response.json({
-                    'success': True,
-                    'channels': text_channels
-                })
+        entry = await get_cached_guild_channels(guild_id)
+        headers = {
+            'ETag': entry['etag'],
+            'Cache-Control': 'private, no-cache'
+        }
+
+        if etag_matches(request, entry['etag']):
+            return response.empty(status=304, headers=headers)
+
+        return response.raw(entry['body'], content_type='application/json', headers=headers)
+    except DiscordError as e:
+        return discord_error_response(e.response, "Nem sikerült lekérni a csatornákat!")
     except Exception as e:
         print(f"Hiba a channels lekérése során: {e}")
-        response.json({"success": False, "error": f"Error: {e}"}, status=500)
+        return response.json({"success": False, "error": f"Error: {e}"}, status=500)
+
+def build_dropdown_payload(dropdown_data, custom_id):
+    select_options = []
+
+    for opt in dropdown_data.get("options", []):
+        option_dict = {
+            "label": opt.get("label"),
+            "value": opt.get("value")
+        }
+
+        if opt.get("description"):
+            option_dict["description"] = opt.get("description")
+
+        if opt.get("emoji"):
+            option_dict["emoji"] = {"name": opt["emoji"]} # így kell discord objektumot kuldeni -.- azt hittem, hogy szimpla opt.get(), dict-be kell rakni.
+        
+        # azt se tudtam, hogy van ilyen h default xdd
+
+        if opt.get("default"):
+            option_dict["default"] = True
+
+        select_options.append(option_dict)
+
+    select_component = {
+        "type": 1,
+        "components": [{
+            "type": 3,
+            "custom_id": custom_id,
+            "placeholder": dropdown_data.get("placeholder") or "Válassz egy opciót...",
+            "min_values": select_limit(dropdown_data, "min_values"),
+            "max_values": select_limit(dropdown_data, "max_values"),
+            "options": select_options
+        }]
+    }
+
+    return {
+        "content": dropdown_data.get("message", None),
+        "components": [select_component]
+    }
+
+def with_custom_id(payload, custom_id):
+    # csak a select komponenst masoljuk le, az opciok listaja kozos marad
+    select = dict(payload["components"][0]["components"][0], custom_id=custom_id)
+    return dict(payload, components=[{"type": 1, "components": [select]}])
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+def serialize_payload(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+
+def build_embed_payload(embed_data):
+    # Embed építése
+    discord_embed = {}
+    
+    if embed_data.get('title'):
+        discord_embed['title'] = embed_data['title']
+    
+    if embed_data.get('description'):
+        discord_embed['description'] = embed_data['description']
+    
+    if embed_data.get('color'):
+        color_hex = embed_data['color'].replace('#', '')
+        discord_embed['color'] = int(color_hex, 16)
+    
+    if embed_data.get('url'):
+        discord_embed['url'] = embed_data['url']
+    
+    if embed_data.get('timestamp'):
+        discord_embed['timestamp'] = embed_data['timestamp']
+    
+    # Author
+    if embed_data.get('author_name'):
+        discord_embed['author'] = {
+            'name': embed_data['author_name']
+        }
+        if embed_data.get('author_url'):
+            discord_embed['author']['url'] = embed_data['author_url']
+        if embed_data.get('author_icon'):
+            discord_embed['author']['icon_url'] = embed_data['author_icon']
+    
+    # Footer
+    if embed_data.get('footer_text'):
+        discord_embed['footer'] = {
+            'text': embed_data['footer_text']
+        }
+        if embed_data.get('footer_icon'):
+            discord_embed['footer']['icon_url'] = embed_data['footer_icon']
+    
+    # Thumbnail
+    if embed_data.get('thumbnail'):
+        discord_embed['thumbnail'] = {
+            'url': embed_data['thumbnail']
+        }
+    
+    # Image
+    if embed_data.get('image'):
+        discord_embed['image'] = {
+            'url': embed_data['image']
+        }
+    
+    # Fields
+    if embed_data.get('fields'):
+        discord_embed['fields'] = []
+        for field in embed_data['fields']:
+            if field.get('name') and field.get('value'):
+                discord_embed['fields'].append({
+                    'name': field['name'],
+                    'value': field['value'],
+                    'inline': field.get('inline', False)
+                })
+    
+    return {
+        'embeds': [discord_embed]
+    }
 
 @app.post("/api/dropdown/send")
 async def send_dropdown(request):
     session_id = get_session_from_request(request)
-    user = get_user_from_session(session_id)
+    user = await get_user_from_session(session_id)
 
     if not user:
         return response.json({'success': False, 'error': 'Nem vagy bejelentkezve'}, status=401)
@@ -324,82 +1168,45 @@ async def send_dropdown(request):
         guild_id = int(data.get("guild_id"))
         channel_id = data.get("channel_id")
         dropdown_data = data.get("dropdown")
+        template_name = data.get("template")
 
-        if not channel_id or not dropdown_data:
+        if not channel_id or not (dropdown_data or template_name):
             return response.json({'success': False, 'error': 'Hiányzó adatok'}, status=400)
         
-        if not db.check_user_guild_permission(user['user_id'], guild_id):
+        if not await has_guild_permission(user['user_id'], guild_id):
             return response.json({'success': False, 'error': 'Nincs jogosultságod ehhez a szerverhez'}, status=403)
         
-        options = dropdown_data.get("options", [])
+        try:
+            channel_id = parse_snowflake(channel_id)
+        except ValueError:
+            return response.json({'success': False, 'error': 'Érvénytelen channel_id'}, status=400)
+
+        error_response = await check_target_channels(guild_id, [channel_id])
+        if error_response:
+            return error_response
+
+        if template_name:
+            template = await get_template(guild_id, template_name, 'dropdown')
+            if not template:
+                return response.json({'success': False, 'error': 'Nincs ilyen dropdown sablon'}, status=404)
+            payload = template['payload']
+        else:
+            errors = validate_dropdown(dropdown_data)
+            if errors:
+                return validation_error_response(errors)
+
+            payload = build_dropdown_payload(
+                dropdown_data,
+                dropdown_data.get("custom_id") or f"dropdown_{guild_id}_{channel_id}"
+            )
 
-        if not options:
-            return response.json({'success': False, 'error': 'Legalább 1 opció szükséges'}, status=400)
+        job_id = await app.ctx.jobs.enqueue('dropdown', guild_id, channel_id, user['user_id'], request.ip, payload)
         
-        if len(options) > 25:
-            return response.json({'success': False, 'error': 'Maximum 25 opció lehet'}, status=400)
-
-        async with aiohttp.ClientSession() as session:
-            headers = {
-                "Authorization": f"Bot {DISCORD_BOT_TOKEN}",
-                "Content-Type": "application/json"
-            }
-
-            select_options = []
-
-            for opt in options:
-                option_dict = {
-                    "label": opt.get("label"),
-                    "value": opt.get("value")
-                }
-
-                if opt.get("description"):
-                    option_dict["description"] = opt.get("description")
-
-                if opt.get("emoji"):
-                    option_dict["emoji"] = {"name": opt["emoji"]} # így kell discord objektumot kuldeni -.- azt hittem, hogy szimpla opt.get(), dict-be kell rakni.
-                
-                # azt se tudtam, hogy van ilyen h default xdd
-
-                if opt.get("default"):
-                    option_dict["default"] = True
-
-                select_options.append(option_dict)
-
-            select_component = {
-                "type": 1,
-                "components": [{
-                    "type": 3,
-                    "custom_id": dropdown_data.get("custom_id", f"dropdown_{guild_id}_{channel_id}"),
-                    "placeholder": dropdown_data.get("placeholder", "Válassz egy opciót..."),
-                    "min_values": dropdown_data.get("min_values", 1),
-                    "max_values": dropdown_data.get("max_values", 1),
-                    "options": select_options
-                }]
-            }
-
-            payload = {
-                "content": dropdown_data.get("message", None),
-                "components": [select_component]
-            }
-
-            async with session.post(
-                f'{DISCORD_API_ENDPOINT}/channels/{channel_id}/messages',
-                headers=headers,
-                json=payload
-            ) as resp:
-                if resp.status not in [200, 201]:
-                    error_text = await resp.text()
-                    print(f"❌ Dropdown küldési hiba: {error_text}")
-                    return response.json({'success': False, 'error': 'Nem sikerült elküldeni a dropdown-ot'}, status=500)
-                
-                result = await resp.json()
-                
-                return response.json({
-                    'success': True,
-                    'message': 'Dropdown sikeresen elküldve!',
-                    'message_id': result['id']
-                })
+        return response.json({
+            'success': True,
+            'message': 'Dropdown sorba állítva',
+            'job_id': job_id
+        }, status=202)
 
     except Exception as e:
         print(f"❌ Hiba az embed küldése során: {e}")
@@ -408,7 +1215,7 @@ async def send_dropdown(request):
 @app.post("/api/embed/send")
 async def send_embed(request):
     session_id = get_session_from_request(request)
-    user = get_user_from_session(session_id)
+    user = await get_user_from_session(session_id)
     
     if not user:
         return response.json({'success': False, 'error': 'Nem vagy bejelentkezve'}, status=401)
@@ -418,114 +1225,390 @@ async def send_embed(request):
         guild_id = int(data.get('guild_id'))
         channel_id = data.get('channel_id')
         embed_data = data.get('embed')
+        template_name = data.get('template')
         
-        if not channel_id or not embed_data:
+        if not channel_id or not (embed_data or template_name):
             return response.json({'success': False, 'error': 'Hiányzó adatok'}, status=400)
         
-        if not db.check_user_guild_permission(user['user_id'], guild_id):
+        if not await has_guild_permission(user['user_id'], guild_id):
             return response.json({'success': False, 'error': 'Nincs jogosultságod ehhez a szerverhez'}, status=403)
         
-        # Embed küldése Discord API-n keresztül
-        async with aiohttp.ClientSession() as session:
-            headers = {
-                'Authorization': f'Bot {DISCORD_BOT_TOKEN}',
-                'Content-Type': 'application/json'
-            }
-            
-            # Embed építése
-            discord_embed = {}
-            
-            if embed_data.get('title'):
-                discord_embed['title'] = embed_data['title']
-            
-            if embed_data.get('description'):
-                discord_embed['description'] = embed_data['description']
-            
-            if embed_data.get('color'):
-                color_hex = embed_data['color'].replace('#', '')
-                discord_embed['color'] = int(color_hex, 16)
-            
-            if embed_data.get('url'):
-                discord_embed['url'] = embed_data['url']
-            
-            if embed_data.get('timestamp'):
-                discord_embed['timestamp'] = embed_data['timestamp']
-            
-            # Author
-            if embed_data.get('author_name'):
-                discord_embed['author'] = {
-                    'name': embed_data['author_name']
-                }
-                if embed_data.get('author_url'):
-                    discord_embed['author']['url'] = embed_data['author_url']
-                if embed_data.get('author_icon'):
-                    discord_embed['author']['icon_url'] = embed_data['author_icon']
-            
-            # Footer
-            if embed_data.get('footer_text'):
-                discord_embed['footer'] = {
-                    'text': embed_data['footer_text']
-                }
-                if embed_data.get('footer_icon'):
-                    discord_embed['footer']['icon_url'] = embed_data['footer_icon']
-            
-            # Thumbnail
-            if embed_data.get('thumbnail'):
-                discord_embed['thumbnail'] = {
-                    'url': embed_data['thumbnail']
-                }
-            
-            # Image
-            if embed_data.get('image'):
-                discord_embed['image'] = {
-                    'url': embed_data['image']
-                }
-            
-            # Fields
-            if embed_data.get('fields'):
-                discord_embed['fields'] = []
-                for field in embed_data['fields']:
-                    if field.get('name') and field.get('value'):
-                        discord_embed['fields'].append({
-                            'name': field['name'],
-                            'value': field['value'],
-                            'inline': field.get('inline', False)
-                        })
-            
-            payload = {
-                'embeds': [discord_embed]
-            }
+        try:
+            channel_id = parse_snowflake(channel_id)
+        except ValueError:
+            return response.json({'success': False, 'error': 'Érvénytelen channel_id'}, status=400)
+
+        error_response = await check_target_channels(guild_id, [channel_id])
+        if error_response:
+            return error_response
+
+        if template_name:
+            template = await get_template(guild_id, template_name, 'embed')
+            if not template:
+                return response.json({'success': False, 'error': 'Nincs ilyen embed sablon'}, status=404)
+            payload = template['payload']
+        else:
+            # a Discord limiteket helyben ellenorizzuk, ne egy 400-as Discord valaszbol deruljon ki
+            errors = validate_embed(embed_data)
+            if errors:
+                return validation_error_response(errors)
+
+            payload = build_embed_payload(embed_data)
+        
+        # Embed küldése a job queue-n keresztul, a kezbesites a hatterben tortenik
+        job_id = await app.ctx.jobs.enqueue('embed', guild_id, channel_id, user['user_id'], request.ip, payload)
+        
+        return response.json({
+            'success': True,
+            'message': 'Embed sorba állítva',
+            'job_id': job_id
+        }, status=202)
             
-            async with session.post(
-                f'{DISCORD_API_ENDPOINT}/channels/{channel_id}/messages',
-                headers=headers,
-                json=payload
-            ) as resp:
-                if resp.status not in [200, 201]:
-                    error_text = await resp.text()
-                    print(f"❌ Embed küldési hiba: {error_text}")
-                    return response.json({'success': False, 'error': 'Nem sikerült elküldeni az embedet'}, status=500)
-                
-                result = await resp.json()
-                
-                db.log_action(
-                    user['user_id'],
-                    guild_id,
-                    'embed_sent',
-                    f"Embed elküldve a #{channel_id} csatornába",
-                    request.ip
-                )
-                
-                return response.json({
-                    'success': True,
-                    'message': 'Embed sikeresen elküldve!',
-                    'message_id': result['id']
-                })
-                
     except Exception as e:
         print(f"❌ Hiba az embed küldése során: {e}")
         return response.json({'success': False, 'error': str(e)}, status=500)
 
+async def get_template(guild_id, name, kind=None):
+    if not isinstance(name, str) or not TEMPLATE_NAME_PATTERN.match(name):
+        return None
+
+    template = await templates.get(guild_id, name)
+    if template is None or (kind and template['kind'] != kind):
+        return None
+    return template
+
+def template_response(template):
+    return {
+        'name': template['name'],
+        'kind': template['kind'],
+        'source': template['source'],
+        'updated_at': template['updated_at']
+    }
+
+@app.get("/api/templates/<guild_id>")
+async def list_templates(request, guild_id):
+    session_id = get_session_from_request(request)
+    user = await get_user_from_session(session_id)
+    
+    if not user:
+        return response.json({'success': False, 'error': 'Nem vagy bejelentkezve'}, status=401)
+    
+    try:
+        guild_id = int(guild_id)
+    except ValueError:
+        return response.json({'success': False, 'error': 'Érvénytelen guild_id'}, status=400)
+    
+    if not await has_guild_permission(user['user_id'], guild_id):
+        return response.json({'success': False, 'error': 'Nincs jogosultságod ehhez a szerverhez'}, status=403)
+    
+    try:
+        entries = await templates.list(guild_id)
+        return response.json({'success': True, 'templates': [template_response(entry) for entry in entries]})
+    except Exception as e:
+        print(f"❌ Hiba a sablonok lekérése során: {e}")
+        return response.json({'success': False, 'error': str(e)}, status=500)
+
+@app.put("/api/templates/<guild_id>/<name>")
+async def save_template(request, guild_id, name):
+    session_id = get_session_from_request(request)
+    user = await get_user_from_session(session_id)
+    
+    if not user:
+        return response.json({'success': False, 'error': 'Nem vagy bejelentkezve'}, status=401)
+    
+    try:
+        guild_id = int(guild_id)
+    except ValueError:
+        return response.json({'success': False, 'error': 'Érvénytelen guild_id'}, status=400)
+
+    if not TEMPLATE_NAME_PATTERN.match(name):
+        return response.json({'success': False, 'error': 'Érvénytelen sablon név (max 64 karakter: betű, szám, _ és -)'}, status=400)
+    
+    if not await has_guild_permission(user['user_id'], guild_id):
+        return response.json({'success': False, 'error': 'Nincs jogosultságod ehhez a szerverhez'}, status=403)
+    
+    try:
+        data = request.json or {}
+        embed_data = data.get('embed')
+        dropdown_data = data.get('dropdown')
+
+        # menteskor egyszer validalunk es szerializalunk, kuldeskor mar csak a kesz JSON megy ki
+        if embed_data:
+            kind, source = 'embed', embed_data
+            errors = validate_embed(embed_data)
+            payload = None if errors else build_embed_payload(embed_data)
+        elif dropdown_data:
+            kind, source = 'dropdown', dropdown_data
+            errors = validate_dropdown(dropdown_data)
+            payload = None if errors else build_dropdown_payload(
+                dropdown_data,
+                dropdown_data.get("custom_id") or f"dropdown_{guild_id}_{name}"
+            )
+        else:
+            return response.json({'success': False, 'error': 'Hiányzó adatok'}, status=400)
+
+        if errors:
+            return validation_error_response(errors)
+
+        existing = await templates.list(guild_id)
+        if len(existing) >= TEMPLATE_MAX_PER_GUILD and name not in [entry['name'] for entry in existing]:
+            return response.json({'success': False, 'error': f'Maximum {TEMPLATE_MAX_PER_GUILD} sablon lehet szerverenként'}, status=400)
+
+        template = await templates.save(guild_id, name, kind, source, serialize_payload(payload), user['user_id'])
+        bus.publish('template', guild_id, name)
+
+        app.ctx.audit.log(
+            user['user_id'],
+            guild_id,
+            'template_saved',
+            f"{kind} sablon mentve: {name}",
+            request.ip
+        )
+
+        return response.json({'success': True, 'template': template_response(template)})
+
+    except Exception as e:
+        print(f"❌ Hiba a sablon mentése során: {e}")
+        return response.json({'success': False, 'error': str(e)}, status=500)
+
+@app.delete("/api/templates/<guild_id>/<name>")
+async def delete_template(request, guild_id, name):
+    session_id = get_session_from_request(request)
+    user = await get_user_from_session(session_id)
+    
+    if not user:
+        return response.json({'success': False, 'error': 'Nem vagy bejelentkezve'}, status=401)
+    
+    try:
+        guild_id = int(guild_id)
+    except ValueError:
+        return response.json({'success': False, 'error': 'Érvénytelen guild_id'}, status=400)
+    
+    if not await has_guild_permission(user['user_id'], guild_id):
+        return response.json({'success': False, 'error': 'Nincs jogosultságod ehhez a szerverhez'}, status=403)
+    
+    try:
+        if not TEMPLATE_NAME_PATTERN.match(name) or not await templates.delete(guild_id, name):
+            return response.json({'success': False, 'error': 'Nem található'}, status=404)
+
+        bus.publish('template', guild_id, name)
+
+        app.ctx.audit.log(
+            user['user_id'],
+            guild_id,
+            'template_deleted',
+            f"Sablon törölve: {name}",
+            request.ip
+        )
+
+        return response.json({'success': True})
+
+    except Exception as e:
+        print(f"❌ Hiba a sablon törlése során: {e}")
+        return response.json({'success': False, 'error': str(e)}, status=500)
+
+async def deliver_job(job, payload):
+    channel_id = job['channel_id']
+
+    # a payload a job queue-bol mar kesz JSON szoveg, valtozatlanul kuldjuk tovabb
+    resp = await app.ctx.discord.post(
+        f'/channels/{channel_id}/messages',
+        bot=True,
+        data=payload.encode('utf-8'),
+        headers=JSON_HEADERS
+    )
+
+    if resp.status in [200, 201]:
+        if job['kind'] == 'embed':
+            app.ctx.audit.log(
+                job['user_id'],
+                job['guild_id'],
+                'embed_sent',
+                f"Embed elküldve a #{channel_id} csatornába",
+                job['ip']
+            )
+        return 'sent', resp.json()['id']
+
+    if resp.status == 404:
+        invalidate_guild_channels(job['guild_id'])
+
+    print(f"❌ {job['kind']} küldési hiba ({resp.status}): {resp.text}")
+
+    # rate limit es Discord oldali hiba: kesobb ujra, minden mas 4xx vegleges
+    if resp.status == 429 or resp.status >= 500:
+        return 'retry', f"Discord {resp.status}"
+    return 'failed', f"Discord {resp.status}: {resp.text[:500]}"
+
+@app.get("/api/jobs/<job_id>")
+async def get_job(request, job_id):
+    session_id = get_session_from_request(request)
+    user = await get_user_from_session(session_id)
+    
+    if not user:
+        return response.json({'success': False, 'error': 'Nem vagy bejelentkezve'}, status=401)
+    
+    job = await job_store.get(job_id)
+
+    if not job or (job['user_id'] != user['user_id'] and not await has_guild_permission(user['user_id'], job['guild_id'])):
+        return response.json({'success': False, 'error': 'Nem található'}, status=404)
+
+    return response.json({
+        'success': True,
+        'job': {
+            'id': job['id'],
+            'kind': job['kind'],
+            'guild_id': str(job['guild_id']),
+            'channel_id': job['channel_id'],
+            'status': job['status'],
+            'attempts': job['attempts'],
+            'message_id': job['message_id'],
+            'error': job['error'],
+            'created_at': job['created_at'],
+            'updated_at': job['updated_at']
+        }
+    })
+
+def parse_bulk_targets(data):
+    # vagy {"guild_id": ..., "channel_ids": [...]}, vagy {"targets": [{"guild_id": ..., "channel_id": ...}]}
+    targets = []
+
+    if data.get('channel_ids'):
+        guild_id = int(data.get('guild_id'))
+        for channel_id in data['channel_ids']:
+            targets.append((guild_id, parse_snowflake(channel_id)))
+
+    for target in data.get('targets') or []:
+        targets.append((int(target.get('guild_id')), parse_snowflake(target.get('channel_id'))))
+
+    # duplikalt csatornara ne kuldjunk ketszer
+    return list(dict.fromkeys(targets))
+
+async def send_bulk_message(guild_id, channel_id, body, semaphore):
+    async with semaphore:
+        try:
+            resp = await app.ctx.discord.post(f'/channels/{channel_id}/messages', bot=True, data=body, headers=JSON_HEADERS)
+        except Exception as e:
+            return {'guild_id': str(guild_id), 'channel_id': channel_id, 'success': False, 'error': str(e)}
+
+    if resp.status not in [200, 201]:
+        if resp.status == 404:
+            invalidate_guild_channels(guild_id)
+        print(f"❌ Bulk küldési hiba (#{channel_id}): {resp.text}")
+        return {'guild_id': str(guild_id), 'channel_id': channel_id, 'success': False, 'status': resp.status, 'error': 'Nem sikerült elküldeni'}
+
+    return {'guild_id': str(guild_id), 'channel_id': channel_id, 'success': True, 'message_id': resp.json()['id']}
+
+@app.post("/api/send/bulk")
+async def send_bulk(request):
+    session_id = get_session_from_request(request)
+    user = await get_user_from_session(session_id)
+    
+    if not user:
+        return response.json({'success': False, 'error': 'Nem vagy bejelentkezve'}, status=401)
+    
+    try:
+        data = request.json
+        targets = parse_bulk_targets(data)
+        embed_data = data.get('embed')
+        dropdown_data = data.get('dropdown')
+        template_name = data.get('template')
+    except (TypeError, ValueError, AttributeError):
+        return response.json({'success': False, 'error': 'Érvénytelen adatok'}, status=400)
+
+    if not targets or not (embed_data or dropdown_data or template_name):
+        return response.json({'success': False, 'error': 'Hiányzó adatok'}, status=400)
+
+    if len(targets) > BULK_SEND_MAX_TARGETS:
+        return response.json({'success': False, 'error': f'Maximum {BULK_SEND_MAX_TARGETS} csatorna lehet'}, status=400)
+
+    guild_ids = list(dict.fromkeys(guild_id for guild_id, _ in targets))
+    allowed = await asyncio.gather(*(has_guild_permission(user['user_id'], guild_id) for guild_id in guild_ids))
+
+    if not all(allowed):
+        return response.json({'success': False, 'error': 'Nincs jogosultságod ehhez a szerverhez'}, status=403)
+
+    channel_errors = await asyncio.gather(*(
+        check_target_channels(guild_id, [channel_id for target_guild_id, channel_id in targets if target_guild_id == guild_id])
+        for guild_id in guild_ids
+    ))
+    for error_response in channel_errors:
+        if error_response:
+            return error_response
+
+    # a payloadot egyszer epitjuk fel es szerializaljuk, csak a dropdown custom_id-ja csatornankent mas (ha nincs megadva)
+    if template_name:
+        # a sablon guildenkent van mentve, minden guild a sajat azonos nevu sablonjat kapja
+        found = await asyncio.gather(*(get_template(guild_id, template_name) for guild_id in guild_ids))
+        missing = [str(guild_id) for guild_id, template in zip(guild_ids, found) if template is None]
+        if missing:
+            return response.json({'success': False, 'error': f"Nincs ilyen sablon: {', '.join(missing)}"}, status=404)
+
+        bodies_by_guild = {guild_id: template['payload'].encode('utf-8') for guild_id, template in zip(guild_ids, found)}
+        bodies = [bodies_by_guild[guild_id] for guild_id, _ in targets]
+        action = 'template_bulk_sent'
+    elif embed_data:
+        errors = validate_embed(embed_data)
+        if errors:
+            return validation_error_response(errors)
+
+        body = serialize_payload(build_embed_payload(embed_data)).encode('utf-8')
+        bodies = [body] * len(targets)
+        action = 'embed_bulk_sent'
+    else:
+        errors = validate_dropdown(dropdown_data)
+        if errors:
+            return validation_error_response(errors)
+
+        custom_id = dropdown_data.get("custom_id")
+        payload = build_dropdown_payload(dropdown_data, custom_id)
+        if custom_id:
+            bodies = [serialize_payload(payload).encode('utf-8')] * len(targets)
+        else:
+            bodies = [
+                serialize_payload(with_custom_id(payload, f"dropdown_{guild_id}_{channel_id}")).encode('utf-8')
+                for guild_id, channel_id in targets
+            ]
+        action = 'dropdown_bulk_sent'
+
+    semaphore = asyncio.Semaphore(BULK_SEND_CONCURRENCY)
+    tasks = [
+        asyncio.ensure_future(send_bulk_message(guild_id, channel_id, body, semaphore))
+        for (guild_id, channel_id), body in zip(targets, bodies)
+    ]
+
+    stream = await request.respond(content_type='application/x-ndjson')
+    results = []
+
+    try:
+        for finished in asyncio.as_completed(tasks):
+            result = await finished
+            results.append(result)
+            await stream.send(json.dumps(result, ensure_ascii=False) + '\n')
+
+        sent = len([r for r in results if r['success']])
+        await stream.send(json.dumps({'done': True, 'sent': sent, 'failed': len(results) - sent}) + '\n')
+        await stream.eof()
+    finally:
+        # ha a kliens kozben lezarta a kapcsolatot, a meg el nem kuldotteket eldobjuk
+        for task in tasks:
+            task.cancel()
+
+        # guildenkent egy bejegyzes, csak az adott guild csatornaival; az audit log egy batch-ben irja ki oket
+        for guild_id in guild_ids:
+            sent_channels = [r['channel_id'] for r in results if r['success'] and r['guild_id'] == str(guild_id)]
+            if not sent_channels:
+                continue
+
+            guild_targets = len([1 for target_guild_id, _ in targets if target_guild_id == guild_id])
+            app.ctx.audit.log(
+                user['user_id'],
+                guild_id,
+                action,
+                f"Tömeges küldés: {len(sent_channels)}/{guild_targets} sikeres ("
+                + ', '.join(f"#{channel_id}" for channel_id in sent_channels) + ")",
+                request.ip
+            )
+
 
 if __name__ == "__main__":
     print(f"""
@@ -537,4 +1620,4 @@ if __name__ == "__main__":
     ║  Bot Invite: http://localhost:8000/invite    ║
     ╚══════════════════════════════════════════════╝
     """)
-    app.run(host="0.0.0.0", port=8000)
\ No newline at end of file
+    app.run(host="0.0.0.0", port=8000, workers=API_WORKERS)
\ No newline at end of file
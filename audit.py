@@ -0,0 +1,103 @@
+import asyncio
+import time
+
+
+class AuditLog:
+    # az audit bejegyzeseket sorba tesszuk es a hatterben, batch-ekben irjuk ki,
+    # igy a request nem var a log_action INSERT-re
+
+    def __init__(self, db, max_queue=10000, batch_size=100, flush_interval=1.0):
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.task = None
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self.last_flush_at = None
+
+    def log(self, user_id, guild_id, action, details, ip):
+        try:
+            self.queue.put_nowait((user_id, guild_id, action, details, ip))
+            self.enqueued += 1
+        except asyncio.QueueFull:
+            self.dropped += 1
+            print(f"⚠️ Audit queue megtelt, bejegyzés eldobva: {action} ({guild_id})")
+
+    def start(self):
+        self.task = asyncio.get_running_loop().create_task(self.run())
+
+    async def run(self):
+        # a None a close() jelzese: a mar kivett bejegyzeseket meg kiirjuk, utana kilepunk
+        while True:
+            entry = await self.queue.get()
+            if entry is None:
+                return
+
+            batch = [entry]
+            stopping = False
+            deadline = time.monotonic() + self.flush_interval
+
+            # vagy megvan a batch meret, vagy lejart az intervallum
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if entry is None:
+                    stopping = True
+                    break
+                batch.append(entry)
+
+            await self.write(batch)
+
+            if stopping:
+                return
+
+    async def write(self, batch):
+        try:
+            failed = await self.db.call_many('log_action', batch)
+        except Exception as e:
+            print(f"❌ Audit log írási hiba: {e}")
+            failed = len(batch)
+
+        self.batches += 1
+        self.failed += failed
+        self.written += len(batch) - failed
+        self.last_flush_at = time.time()
+
+    async def close(self):
+        if self.task is not None:
+            # nem cancel-eljuk, kulonben a run() altal mar osszegyujtott batch elveszne
+            await self.queue.put(None)
+            await self.task
+            self.task = None
+
+        # leallaskor ami meg a sorban van, azt is kiirjuk
+        batch = []
+        while not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+            if len(batch) >= self.batch_size:
+                await self.write(batch)
+                batch = []
+
+        if batch:
+            await self.write(batch)
+
+    def stats(self):
+        return {
+            'queued': self.queue.qsize(),
+            'enqueued': self.enqueued,
+            'dropped': self.dropped,
+            'written': self.written,
+            'failed': self.failed,
+            'batches': self.batches,
+            'last_flush_at': self.last_flush_at
+        }
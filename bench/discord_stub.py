@@ -0,0 +1,152 @@
+"""Helyi Discord API stub a benchmarkhoz.
+
+Csak azokat az endpointokat tudja, amiket az api.py hasznal. A valaszido es a
+429-ek aranya parancssorbol allithato.
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import time
+
+from aiohttp import web
+
+API_PREFIX = '/api/v10'
+
+
+class DiscordStub:
+
+    def __init__(self, latency=0.05, jitter=0.01, rate_limit_every=0, guilds=150, channels=40):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_every = rate_limit_every
+        self.guilds = [
+            {
+                'id': str(1000 + i),
+                'name': f'Bench Guild {i}',
+                'icon': None,
+                'owner': i % 10 == 0,
+                'permissions': '8' if i % 2 == 0 else '32'
+            }
+            for i in range(guilds)
+        ]
+        self.channel_count = channels
+        self.counter = itertools.count(1)
+        self.snowflakes = itertools.count(900000000000000000)
+
+    async def delay(self):
+        await asyncio.sleep(max(0.0, random.gauss(self.latency, self.jitter)))
+
+    def rate_limited(self):
+        # minden N-edik kerest 429-cel utasitunk el
+        if not self.rate_limit_every:
+            return None
+        if next(self.counter) % self.rate_limit_every != 0:
+            return None
+        return web.json_response(
+            {'message': 'You are being rate limited.', 'retry_after': 0.05, 'global': False},
+            status=429,
+            headers={'Retry-After': '0.05', 'X-RateLimit-Scope': 'user'}
+        )
+
+    def rate_limit_headers(self, bucket):
+        return {
+            'X-RateLimit-Bucket': bucket,
+            'X-RateLimit-Limit': '50',
+            'X-RateLimit-Remaining': '49',
+            'X-RateLimit-Reset-After': '1.0'
+        }
+
+    async def token(self, request):
+        await self.delay()
+        return web.json_response({
+            'access_token': f'bench-token-{time.time_ns()}',
+            'token_type': 'Bearer',
+            'expires_in': 604800,
+            'refresh_token': 'bench-refresh',
+            'scope': 'identify guilds'
+        })
+
+    async def me(self, request):
+        await self.delay()
+        return web.json_response({
+            'id': '1',
+            'username': 'bench',
+            'discriminator': '0',
+            'avatar': None
+        })
+
+    async def my_guilds(self, request):
+        await self.delay()
+        limited = self.rate_limited()
+        if limited is not None:
+            return limited
+
+        limit = int(request.query.get('limit', 200))
+        after = int(request.query.get('after', 0))
+        page = [g for g in self.guilds if int(g['id']) > after][:limit]
+        return web.json_response(page, headers=self.rate_limit_headers('guilds'))
+
+    async def guild_channels(self, request):
+        await self.delay()
+        limited = self.rate_limited()
+        if limited is not None:
+            return limited
+
+        guild_id = int(request.match_info['guild_id'])
+        channels = []
+        for i in range(self.channel_count):
+            channels.append({
+                'id': str(guild_id * 1000 + i),
+                'name': f'channel-{i}',
+                'type': [0, 2, 4, 5][i % 4],
+                'position': self.channel_count - i,
+                'parent_id': None
+            })
+        return web.json_response(channels, headers=self.rate_limit_headers('channels'))
+
+    async def create_message(self, request):
+        await request.read()
+        await self.delay()
+        limited = self.rate_limited()
+        if limited is not None:
+            return limited
+
+        return web.json_response(
+            {'id': str(next(self.snowflakes)), 'channel_id': request.match_info['channel_id']},
+            headers=self.rate_limit_headers('messages')
+        )
+
+    def make_app(self):
+        app = web.Application()
+        app.router.add_post(f'{API_PREFIX}/oauth2/token', self.token)
+        app.router.add_get(f'{API_PREFIX}/users/@me', self.me)
+        app.router.add_get(f'{API_PREFIX}/users/@me/guilds', self.my_guilds)
+        app.router.add_get(f'{API_PREFIX}/guilds/{{guild_id}}/channels', self.guild_channels)
+        app.router.add_post(f'{API_PREFIX}/channels/{{channel_id}}/messages', self.create_message)
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Discord API stub')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--latency', type=float, default=0.05, help='atlagos valaszido masodpercben')
+    parser.add_argument('--jitter', type=float, default=0.01)
+    parser.add_argument('--rate-limit-every', type=int, default=0, help='minden N-edik keres 429 (0 = soha)')
+    parser.add_argument('--guilds', type=int, default=150)
+    parser.add_argument('--channels', type=int, default=40)
+    args = parser.parse_args()
+
+    stub = DiscordStub(
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit_every=args.rate_limit_every,
+        guilds=args.guilds,
+        channels=args.channels
+    )
+    web.run_app(stub.make_app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == '__main__':
+    main()
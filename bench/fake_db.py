@@ -0,0 +1,125 @@
+"""Memoriaban tarolt DatabaseManager a benchmarkhoz.
+
+Ugyanazokat a metodusokat adja, amiket az api.py hasznal. A query ido
+szimulalasahoz blokkolo time.sleep-et hasznal, ugyanugy, ahogy egy szinkron
+Postgres driver is blokkolna.
+"""
+import os
+import threading
+import time
+import uuid
+
+BENCH_SESSION_ID = 'bench-session'
+BENCH_USER_ID = 1
+
+
+class FakeDatabaseManager:
+
+    def __init__(self, latency=None, guilds=None, **kwargs):
+        if latency is None:
+            latency = float(os.getenv('BENCH_DB_LATENCY', '0.002'))
+        if guilds is None:
+            guilds = int(os.getenv('BENCH_GUILDS', '150'))
+
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.sessions = {}
+        self.user_guilds = {}
+        self.messages = {}
+        self.actions = []
+        self.bot_guilds = set()
+
+        guild_rows = []
+        for i in range(guilds):
+            guild_id = 1000 + i
+            guild_rows.append({
+                'guild_id': guild_id,
+                'guild_name': f'Bench Guild {i}',
+                'guild_icon': None,
+                'owner': i % 10 == 0,
+                'permissions': 8 if i % 2 == 0 else 32
+            })
+            if i % 3 != 0:
+                self.bot_guilds.add(guild_id)
+
+        self.user_guilds[BENCH_USER_ID] = guild_rows
+        self.sessions[BENCH_SESSION_ID] = {
+            'user_id': BENCH_USER_ID,
+            'username': 'bench',
+            'discriminator': '0',
+            'avatar': None
+        }
+
+    def query(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def create_session(self, user_data, token_data):
+        self.query()
+        session_id = uuid.uuid4().hex
+        with self.lock:
+            self.sessions[session_id] = {
+                'user_id': int(user_data['id']),
+                'username': user_data['username'],
+                'discriminator': user_data.get('discriminator'),
+                'avatar': user_data.get('avatar')
+            }
+        return session_id
+
+    def get_session(self, session_id):
+        self.query()
+        return self.sessions.get(session_id)
+
+    def delete_session(self, session_id):
+        self.query()
+        with self.lock:
+            self.sessions.pop(session_id, None)
+
+    def sync_user_guilds(self, user_id, guilds):
+        self.query()
+        rows = []
+        for g in guilds:
+            permissions = int(g.get('permissions', 0))
+            rows.append({
+                'guild_id': int(g['id']),
+                'guild_name': g['name'],
+                'guild_icon': g.get('icon'),
+                'owner': g.get('owner', False),
+                'permissions': permissions
+            })
+        with self.lock:
+            self.user_guilds[user_id] = rows
+
+    def get_user_guilds(self, user_id, manageable_only=False):
+        self.query()
+        rows = self.user_guilds.get(user_id, [])
+        if manageable_only:
+            rows = [g for g in rows if g['owner'] or g['permissions'] & 0x28]
+        return list(rows)
+
+    def check_user_guild_permission(self, user_id, guild_id):
+        self.query()
+        for g in self.user_guilds.get(user_id, []):
+            if g['guild_id'] == guild_id:
+                return bool(g['owner'] or g['permissions'] & 0x28)
+        return False
+
+    def is_bot_in_guild(self, guild_id):
+        self.query()
+        return guild_id in self.bot_guilds
+
+    def get_test_message(self, guild_id):
+        self.query()
+        return self.messages.get(guild_id)
+
+    def insert_or_update_message(self, guild_id, message):
+        self.query()
+        with self.lock:
+            self.messages[guild_id] = message
+        return True
+
+    def log_action(self, user_id, guild_id, action, details, ip):
+        self.query()
+        with self.lock:
+            self.actions.append((user_id, guild_id, action, details, ip))
+        return True
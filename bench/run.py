@@ -0,0 +1,209 @@
+"""Terheleses benchmark az api.py-hoz.
+
+Elinditja a Discord stubot es az api.py-t a fake DatabaseManagerrel, majd
+minden route-ot tobb parhuzamossagi szinten meghajt, es RPS / p50 / p99
+ertekeket ir ki. Az eredmeny JSON-ba kerul, hogy verziok kozott ossze
+lehessen hasonlitani:
+
+    python bench/run.py --duration 10 --concurrency 1 10 50 --output bench_results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR))
+
+from fake_db import BENCH_SESSION_ID
+
+GUILD_ID = 1000
+
+SCENARIOS = {
+    'health': ('GET', '/health', None),
+    'me': ('GET', '/api/me', None),
+    'guilds': ('GET', '/api/guilds', None),
+    'config_get': ('GET', f'/api/config/{GUILD_ID}', None),
+    'config_save': ('POST', f'/api/config/{GUILD_ID}', {'test_message': 'bench'}),
+    'channels': ('GET', f'/api/channels/{GUILD_ID}', None),
+    'embed_send': ('POST', '/api/embed/send', {
+        'guild_id': str(GUILD_ID),
+        'channel_id': str(GUILD_ID * 1000),
+        'embed': {'title': 'Bench', 'description': 'Benchmark embed', 'color': '#5865F2'}
+    }),
+    'dropdown_send': ('POST', '/api/dropdown/send', {
+        'guild_id': str(GUILD_ID),
+        'channel_id': str(GUILD_ID * 1000),
+        'dropdown': {'message': 'Bench', 'options': [{'label': 'A', 'value': 'a'}, {'label': 'B', 'value': 'b'}]}
+    }),
+    'bulk_send': ('POST', '/api/send/bulk', {
+        'guild_id': str(GUILD_ID),
+        'channel_ids': [str(GUILD_ID * 1000 + i) for i in (0, 3, 4, 7)],
+        'embed': {'title': 'Bench', 'description': 'Benchmark bulk embed', 'color': '#5865F2'}
+    }),
+    # teljes OAuth kor: token csere, user + guild lista, session letrehozas, guild szinkron; 302-t var
+    'login': ('GET', '/auth/callback?code=bench', None)
+}
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def wait_for_port(host, port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Nem indult el: {host}:{port}")
+
+
+async def run_level(session, base_url, scenario, concurrency, duration):
+    method, path, body = SCENARIOS[scenario]
+    latencies = []
+    statuses = {}
+    deadline = time.monotonic() + duration
+
+    async def worker():
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                async with session.request(method, f'{base_url}{path}', json=body, allow_redirects=False) as resp:
+                    await resp.read()
+                    status = str(resp.status)
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.monotonic()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.monotonic() - started
+
+    latencies.sort()
+    return {
+        'scenario': scenario,
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'rps': round(len(latencies) / elapsed, 2),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3) if latencies else None,
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3) if latencies else None,
+        'max_ms': round(latencies[-1] * 1000, 3) if latencies else None,
+        'statuses': statuses
+    }
+
+
+async def run_benchmark(base_url, scenarios, levels, duration, warmup):
+    # a session cookie-t fejlecben kuldjuk es a valaszok cookie-jait eldobjuk, kulonben a login
+    # scenario atallitana a tobbi scenario sessionjet
+    headers = {'Cookie': f'session_id={BENCH_SESSION_ID}'}
+    connector = aiohttp.TCPConnector(limit=0)
+
+    results = []
+    async with aiohttp.ClientSession(
+        headers=headers, cookie_jar=aiohttp.DummyCookieJar(), connector=connector
+    ) as session:
+        for scenario in scenarios:
+            if warmup:
+                await run_level(session, base_url, scenario, 1, warmup)
+
+            for concurrency in levels:
+                result = await run_level(session, base_url, scenario, concurrency, duration)
+                results.append(result)
+                print(
+                    f"{scenario:<14} c={concurrency:<4} {result['rps']:>9.1f} rps  "
+                    f"p50={result['p50_ms']}ms  p99={result['p99_ms']}ms  {result['statuses']}"
+                )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='api.py benchmark')
+    parser.add_argument('--scenarios', nargs='+', default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 10, 50])
+    parser.add_argument('--duration', type=float, default=10.0, help='masodperc szintenkent')
+    parser.add_argument('--warmup', type=float, default=1.0)
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--api-port', type=int, default=8000)
+    parser.add_argument('--stub-port', type=int, default=8081)
+    parser.add_argument('--discord-latency', type=float, default=0.05)
+    parser.add_argument('--rate-limit-every', type=int, default=0)
+    parser.add_argument('--db-latency', type=float, default=0.002)
+    parser.add_argument('--no-spawn', action='store_true', help='mar futo api/stub ellen meres')
+    args = parser.parse_args()
+
+    host = '127.0.0.1'
+    processes = []
+
+    try:
+        if not args.no_spawn:
+            processes.append(subprocess.Popen([
+                sys.executable, str(BENCH_DIR / 'discord_stub.py'),
+                '--port', str(args.stub_port),
+                '--latency', str(args.discord_latency),
+                '--rate-limit-every', str(args.rate_limit_every)
+            ]))
+            wait_for_port(host, args.stub_port)
+
+            env = dict(os.environ, BENCH_DB_LATENCY=str(args.db_latency))
+            processes.append(subprocess.Popen([
+                sys.executable, str(BENCH_DIR / 'serve.py'),
+                '--port', str(args.api_port),
+                '--discord', f'http://{host}:{args.stub_port}/api/v10'
+            ], env=env))
+            wait_for_port(host, args.api_port)
+
+        results = asyncio.run(run_benchmark(
+            f'http://{host}:{args.api_port}',
+            args.scenarios,
+            args.concurrency,
+            args.duration,
+            args.warmup
+        ))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=10)
+
+    git_rev = subprocess.run(
+        ['git', 'rev-parse', '--short', 'HEAD'],
+        cwd=BENCH_DIR, capture_output=True, text=True
+    ).stdout.strip()
+
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'git_rev': git_rev or None,
+        'python': platform.python_version(),
+        'settings': {
+            'duration': args.duration,
+            'concurrency': args.concurrency,
+            'discord_latency': args.discord_latency,
+            'rate_limit_every': args.rate_limit_every,
+            'db_latency': args.db_latency
+        },
+        'results': results
+    }
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"✅ Eredmények mentve: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Az api.py inditasa a fake DatabaseManagerrel es a helyi Discord stubbal."""
+import argparse
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+import types
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR))
+sys.path.insert(0, str(BENCH_DIR.parent))
+
+from fake_db import FakeDatabaseManager
+
+
+def install_fake_database():
+    # a common.database helyett a memoriaban tarolt valtozatot toltjuk be
+    common = types.ModuleType('common')
+    database = types.ModuleType('common.database')
+    database.DatabaseManager = FakeDatabaseManager
+    common.database = database
+    sys.modules['common'] = common
+    sys.modules['common.database'] = database
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='api.py benchmark modban')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--discord', default='http://127.0.0.1:8081/api/v10', help='Discord stub base URL')
+    parser.add_argument('--workers', type=int, default=1, help='Sanic worker processzek szama')
+    parser.add_argument('--admission', action='store_true',
+                        help='admission control bekapcsolasa (alapbol ki, kulonben a benchmark a 429-eket merne)')
+    return parser.parse_args()
+
+
+def configure(args):
+    # az api.py import idoben olvassa a kornyezetet, ezert ennek az import elott kell lefutnia
+    os.environ['DISCORD_API_ENDPOINT'] = args.discord
+    os.environ.setdefault('DISCORD_TOKEN', 'bench-bot-token')
+    os.environ.setdefault('DISCORD_CLIENT_ID', 'bench-client')
+    os.environ.setdefault('DISCORD_CLIENT_SECRET', 'bench-secret')
+    os.environ.setdefault('DISCORD_REDIRECT_URI', f'http://{args.host}:{args.port}/auth/callback')
+    os.environ['API_WORKERS'] = str(args.workers)
+    os.environ['ADMISSION_ENABLED'] = '1' if args.admission else '0'
+    # minden futas friss, eldobhato job store-t kap, kilepeskor toroljuk
+    if 'JOB_DB_PATH' not in os.environ:
+        job_dir = tempfile.mkdtemp(prefix='bench_jobs_')
+        atexit.register(shutil.rmtree, job_dir, True)
+        os.environ['JOB_DB_PATH'] = os.path.join(job_dir, 'outbound_jobs.sqlite3')
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    configure(args)
+
+# a Sanic workerek (__mp_main__) ujra importaljak ezt a fajlt; naluk a kornyezetet a fo processz mar beallitotta
+install_fake_database()
+
+import api  # noqa: E402
+
+
+def main(args):
+    if args.workers > 1:
+        api.app.run(host=args.host, port=args.port, access_log=False, workers=args.workers)
+    else:
+        api.app.run(host=args.host, port=args.port, access_log=False, single_process=True)
+
+
+if __name__ == '__main__':
+    main(args)
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import os
+import socket
+import stat
+
+MAX_MESSAGE_SIZE = 65536
+
+
+class InvalidationBus:
+    # workerek kozotti cache invalidalas: minden worker egy sajat Unix datagram socketet
+    # nyit egy kozos konyvtarban, a publish a tobbi socketre kuldi ki az uzenetet.
+    # best effort: ha egy uzenet elveszik, a cache TTL-je korlatozza az elavulast.
+    # csak kulcsokat kuldunk (mit kell eldobni), ertekeket nem, igy az uzenetek kicsik maradnak
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.handlers = {}
+        self.sock = None
+        self.path = None
+
+        self.published = 0
+        self.received = 0
+        self.dropped = 0
+        self.errors = 0
+
+    @property
+    def running(self):
+        return self.sock is not None
+
+    def subscribe(self, event, handler):
+        self.handlers[event] = handler
+
+    def check_directory(self):
+        # barki mas altal letrehozott vagy irhato konyvtarba nem teszunk socketet, kulonben
+        # egy masik user hamis invalidaciokat kuldhetne vagy elkaphatna az uzeneteket
+        info = os.lstat(self.directory)
+        if not stat.S_ISDIR(info.st_mode):
+            raise RuntimeError(f"Az invalidációs busz útvonala nem könyvtár: {self.directory}")
+        if info.st_uid != os.getuid():
+            raise RuntimeError(f"Az invalidációs busz könyvtára más userhez tartozik: {self.directory}")
+        if info.st_mode & 0o077:
+            raise RuntimeError(f"Az invalidációs busz könyvtára mások számára is elérhető ({oct(info.st_mode & 0o777)}): {self.directory}")
+
+    def start(self):
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        self.check_directory()
+        self.path = os.path.join(self.directory, f'{os.getpid()}.sock')
+
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(self.path)
+        sock.setblocking(False)
+        self.sock = sock
+
+        asyncio.get_running_loop().add_reader(sock.fileno(), self.read)
+
+    def close(self):
+        if self.sock is None:
+            return
+
+        asyncio.get_running_loop().remove_reader(self.sock.fileno())
+        self.sock.close()
+        self.sock = None
+
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def read(self):
+        while True:
+            try:
+                data = self.sock.recv(MAX_MESSAGE_SIZE)
+            except (BlockingIOError, InterruptedError):
+                return
+
+            self.received += 1
+
+            try:
+                event, args = json.loads(data)
+                self.handlers[event](*args)
+            except Exception as e:
+                self.errors += 1
+                print(f"❌ Invalidációs üzenet hiba: {e}")
+
+    def peers(self):
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return [os.path.join(self.directory, name) for name in names if name.endswith('.sock')]
+
+    def publish(self, event, *args):
+        # a kuldo worker a sajat cache-et maga frissiti, ide csak a tobbieknek szolo uzenet jon
+        if self.sock is None:
+            return
+
+        data = json.dumps([event, args]).encode('utf-8')
+        if len(data) > MAX_MESSAGE_SIZE:
+            self.errors += 1
+            print(f"❌ Túl nagy invalidációs üzenet ({event}, {len(data)} byte)")
+            return
+
+        self.published += 1
+
+        for path in self.peers():
+            if path == self.path:
+                continue
+
+            try:
+                self.sock.sendto(data, path)
+            except (BlockingIOError, InterruptedError):
+                # a fogado worker puffere tele van
+                self.dropped += 1
+            except ConnectionRefusedError:
+                # leallt worker maradek socketje
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.errors += 1
+                print(f"❌ Invalidációs üzenet küldési hiba ({event}): {e}")
+
+    def stats(self):
+        return {
+            'running': self.running,
+            'peers': max(0, len(self.peers()) - 1) if self.running else 0,
+            'published': self.published,
+            'received': self.received,
+            'dropped': self.dropped,
+            'errors': self.errors
+        }
@@ -0,0 +1,131 @@
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncDatabase:
+    # a szinkron DatabaseManager hivasait egy korlatos thread poolban futtatja,
+    # hogy egy lassu query ne fogja meg az event loopot
+
+    def __init__(self, db, pool_size=10, timeout=10.0):
+        self.db = db
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='db')
+
+        # a thread poolba beadott, de meg be nem fejezett hivasok; a szalon belul csokkentjuk,
+        # igy a timeout-olt, de meg futo query is szamit
+        self.pending = 0
+        self.running = 0
+        self.peak_pending = 0
+        self.lock = threading.Lock()
+        self.total_calls = 0
+        self.total_timeouts = 0
+        self.total_errors = 0
+
+        # observer(name, duration, outcome) - pl. metrikakhoz
+        self.observer = None
+
+    def submit(self, func):
+        with self.lock:
+            self.pending += 1
+            self.total_calls += 1
+            if self.pending > self.peak_pending:
+                self.peak_pending = self.pending
+
+        def tracked():
+            with self.lock:
+                self.running += 1
+            try:
+                return func()
+            finally:
+                with self.lock:
+                    self.running -= 1
+
+        def finished(_):
+            # lefutott, vagy meg inditas elott cancel-eltek (timeout)
+            with self.lock:
+                self.pending -= 1
+
+        future = self.executor.submit(tracked)
+        future.add_done_callback(finished)
+        return asyncio.wrap_future(future)
+
+    async def call(self, name, *args, **kwargs):
+        func = functools.partial(getattr(self.db, name), *args, **kwargs)
+
+        started = time.monotonic()
+        outcome = 'ok'
+
+        try:
+            # timeout utan a query a szalon meg lefuthat, de a request mar nem var ra
+            return await asyncio.wait_for(self.submit(func), self.timeout)
+        except asyncio.TimeoutError:
+            outcome = 'timeout'
+            self.total_timeouts += 1
+            print(f"❌ DB timeout ({self.timeout}s): {name}")
+            raise
+        except Exception:
+            outcome = 'error'
+            self.total_errors += 1
+            raise
+        finally:
+            if self.observer is not None:
+                self.observer(name, time.monotonic() - started, outcome)
+
+    async def call_many(self, name, arg_rows):
+        # tobb azonos hivas egyetlen thread pool job-ban (pl. audit log batch)
+        func = getattr(self.db, name)
+        rows = list(arg_rows)
+
+        def run_many():
+            failed = 0
+            for args in rows:
+                try:
+                    func(*args)
+                except Exception as e:
+                    failed += 1
+                    print(f"❌ DB hiba ({name}): {e}")
+            return failed
+
+        started = time.monotonic()
+        outcome = 'ok'
+
+        try:
+            failed = await asyncio.wait_for(
+                self.submit(run_many),
+                self.timeout * max(1, len(rows))
+            )
+            self.total_errors += failed
+            if failed:
+                outcome = 'error'
+            return failed
+        except asyncio.TimeoutError:
+            outcome = 'timeout'
+            self.total_timeouts += 1
+            print(f"❌ DB timeout: {name} x{len(rows)}")
+            raise
+        finally:
+            if self.observer is not None:
+                self.observer(name, time.monotonic() - started, outcome)
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return functools.partial(self.call, name)
+
+    def stats(self):
+        return {
+            'pool_size': self.pool_size,
+            'busy': self.running,
+            'queued': max(0, self.pending - self.running),
+            'peak_pending': self.peak_pending,
+            'total_calls': self.total_calls,
+            'total_timeouts': self.total_timeouts,
+            'total_errors': self.total_errors
+        }
+
+    def close(self):
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,297 @@
+import asyncio
+import json
+import re
+import time
+
+import aiohttp
+
+MAJOR_PARAMS = ('channels', 'guilds', 'webhooks')
+
+
+class DiscordResponse:
+    # a body-t mar beolvasva tartjuk, igy a connection azonnal visszamegy a poolba
+
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @property
+    def text(self):
+        return self.body.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class DiscordError(Exception):
+
+    def __init__(self, response):
+        super().__init__(f"Discord API hiba ({response.status}): {response.text}")
+        self.response = response
+
+
+class RateLimitBucket:
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.limit = None
+        self.remaining = None
+        self.reset_at = 0.0
+
+    def update(self, headers):
+        try:
+            if 'X-RateLimit-Limit' in headers:
+                self.limit = int(headers['X-RateLimit-Limit'])
+            if 'X-RateLimit-Remaining' in headers:
+                self.remaining = int(headers['X-RateLimit-Remaining'])
+            if 'X-RateLimit-Reset-After' in headers:
+                self.reset_at = time.monotonic() + float(headers['X-RateLimit-Reset-After'])
+        except ValueError:
+            pass
+
+
+def route_key(method, path):
+    # a nem "major" ID-kat kiszedjuk, igy pl. minden /channels/{id}/messages/{id} egy route
+    parts = path.split('?', 1)[0].strip('/').split('/')
+    normalized = []
+
+    for i, part in enumerate(parts):
+        if part.isdigit() and not (i > 0 and parts[i - 1] in MAJOR_PARAMS):
+            normalized.append('{id}')
+        else:
+            normalized.append(part)
+
+    return f"{method} /{'/'.join(normalized)}"
+
+
+def route_label(method, path):
+    # metrika cimkehez minden ID-t kiszedunk (a major ID-kat is), kulonben guildenkent/csatornankent uj sorozat jonne letre
+    parts = path.split('?', 1)[0].strip('/').split('/')
+    return f"{method} /{'/'.join('{id}' if part.isdigit() else part for part in parts)}"
+
+
+def major_key(path):
+    match = re.match(r'^/?(channels|guilds|webhooks)/(\d+)', path)
+    return match.group(0).strip('/') if match else ''
+
+
+class DiscordClient:
+    # egy darab, app-szintu aiohttp session a Discord API-hoz (keep-alive, DNS cache, pool limit)
+
+    def __init__(self, base_url, bot_token, limit=100, limit_per_host=50,
+                 dns_ttl=300, keepalive_timeout=60, timeout=15,
+                 global_rate=50, max_retries=3, max_retry_wait=30):
+        self.base_url = base_url.rstrip('/')
+        self.bot_token = bot_token
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self.session = None
+
+        # rate limit allapot: route -> Discord bucket hash, bucket kulcs -> RateLimitBucket
+        self.global_rate = global_rate
+        self.global_tokens = float(global_rate)
+        self.global_updated_at = time.monotonic()
+        self.global_reset_at = 0.0
+        self.max_retries = max_retries
+        self.max_retry_wait = max_retry_wait
+        self.route_buckets = {}
+        self.buckets = {}
+
+        self.queue_depth = 0
+        self.peak_queue_depth = 0
+        self.total_requests = 0
+        self.total_waits = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.total_429 = 0
+        self.total_retries = 0
+
+        # observer(route_label, status, duration) - pl. metrikakhoz
+        self.observer = None
+
+    async def start(self):
+        if self.session is not None:
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.dns_ttl,
+            use_dns_cache=True,
+            keepalive_timeout=self.keepalive_timeout,
+            enable_cleanup_closed=True
+        )
+
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def get_bucket(self, route, major):
+        key = self.route_buckets.get(route, route) + ':' + major
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = RateLimitBucket()
+        return bucket
+
+    async def acquire_global(self):
+        while True:
+            now = time.monotonic()
+
+            if now < self.global_reset_at:
+                await asyncio.sleep(self.global_reset_at - now)
+                continue
+
+            self.global_tokens = min(
+                float(self.global_rate),
+                self.global_tokens + (now - self.global_updated_at) * self.global_rate
+            )
+            self.global_updated_at = now
+
+            if self.global_tokens >= 1:
+                self.global_tokens -= 1
+                return
+
+            await asyncio.sleep((1 - self.global_tokens) / self.global_rate)
+
+    async def acquire(self, bucket):
+        async with bucket.lock:
+            now = time.monotonic()
+
+            if bucket.remaining is not None and bucket.remaining <= 0 and now < bucket.reset_at:
+                # a lock-ot fogva varunk, igy a tobbi keres is sorban all mogottunk
+                await asyncio.sleep(bucket.reset_at - now)
+                bucket.remaining = bucket.limit
+
+            if bucket.remaining is not None:
+                bucket.remaining -= 1
+
+        await self.acquire_global()
+
+    async def wait_for_slot(self, bucket):
+        started = time.monotonic()
+
+        self.queue_depth += 1
+        if self.queue_depth > self.peak_queue_depth:
+            self.peak_queue_depth = self.queue_depth
+
+        try:
+            await self.acquire(bucket)
+        finally:
+            self.queue_depth -= 1
+
+        waited = time.monotonic() - started
+        if waited > 0.001:
+            self.total_waits += 1
+            self.total_wait_time += waited
+            self.max_wait_time = max(self.max_wait_time, waited)
+
+    def handle_rate_limit(self, route, major, bucket, resp):
+        headers = resp.headers
+
+        if bucket is not None:
+            bucket_hash = headers.get('X-RateLimit-Bucket')
+            if bucket_hash and self.route_buckets.get(route) != bucket_hash:
+                self.route_buckets[route] = bucket_hash
+                bucket = self.get_bucket(route, major)
+            bucket.update(headers)
+
+        if resp.status != 429:
+            return None
+
+        self.total_429 += 1
+
+        retry_after = None
+        try:
+            retry_after = float(resp.json().get('retry_after'))
+        except Exception:
+            pass
+
+        if retry_after is None:
+            try:
+                retry_after = float(headers.get('Retry-After', 1))
+            except ValueError:
+                retry_after = 1.0
+
+        is_global = headers.get('X-RateLimit-Global') == 'true' or headers.get('X-RateLimit-Scope') == 'global'
+        if is_global and bucket is not None:
+            self.global_reset_at = time.monotonic() + retry_after
+
+        return retry_after
+
+    async def request(self, method, path, bot=False, headers=None, **kwargs):
+        if self.session is None:
+            raise RuntimeError("A DiscordClient nincs elindítva")
+
+        request_headers = dict(headers or {})
+
+        if bot:
+            request_headers['Authorization'] = f'Bot {self.bot_token}'
+
+        route = route_key(method, path)
+        started = time.monotonic()
+        status = 'error'
+
+        try:
+            result = await self.send(method, path, route, bot, request_headers, **kwargs)
+            status = result.status
+            return result
+        finally:
+            if self.observer is not None:
+                self.observer(route_label(method, path), status, time.monotonic() - started)
+
+    async def send(self, method, path, route, bot, request_headers, **kwargs):
+        major = major_key(path)
+        attempt = 0
+
+        while True:
+            # csak a bot tokenes kereseknek van kozos (globalis es route) limitje,
+            # a user tokenes OAuth hivasoknal csak a 429-et kezeljuk
+            bucket = None
+            if bot:
+                bucket = self.get_bucket(route, major)
+                await self.wait_for_slot(bucket)
+
+            self.total_requests += 1
+
+            async with self.session.request(method, f'{self.base_url}{path}', headers=request_headers, **kwargs) as resp:
+                body = await resp.read()
+                result = DiscordResponse(resp.status, resp.headers, body)
+
+            retry_after = self.handle_rate_limit(route, major, bucket, result)
+
+            if retry_after is None or attempt >= self.max_retries or retry_after > self.max_retry_wait:
+                return result
+
+            attempt += 1
+            self.total_retries += 1
+            print(f"⚠️ Discord rate limit ({route}), újrapróbálás {retry_after:.2f}s múlva ({attempt}/{self.max_retries})")
+            await asyncio.sleep(retry_after)
+
+    def stats(self):
+        return {
+            'queue_depth': self.queue_depth,
+            'peak_queue_depth': self.peak_queue_depth,
+            'buckets': len(self.buckets),
+            'total_requests': self.total_requests,
+            'total_waits': self.total_waits,
+            'total_wait_time': round(self.total_wait_time, 3),
+            'max_wait_time': round(self.max_wait_time, 3),
+            'total_429': self.total_429,
+            'total_retries': self.total_retries
+        }
+
+    async def get(self, path, **kwargs):
+        return await self.request('GET', path, **kwargs)
+
+    async def post(self, path, **kwargs):
+        return await self.request('POST', path, **kwargs)
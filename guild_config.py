@@ -0,0 +1,74 @@
+import asyncio
+import hashlib
+import json
+
+from cache import TTLCache, MISS
+
+# config mezo -> DatabaseManager getter; uj mezonel eleg ide felvenni
+CONFIG_LOADERS = {
+    'test_message': 'get_test_message'
+}
+
+
+def make_config_entry(config):
+    body = json.dumps({'success': True, **config}, ensure_ascii=False).encode('utf-8')
+    return {
+        'config': config,
+        'body': body,
+        'etag': f'"{hashlib.sha1(body).hexdigest()}"'
+    }
+
+
+class GuildConfigCache:
+    # write-through cache: a mentes ugyanebben a processzben tortenik, igy a cache-t
+    # a mentessel egyutt frissitjuk, a GET-ek pedig nem mennek le a DB-ig
+
+    def __init__(self, db, singleflight, maxsize=5000, ttl=600):
+        self.db = db
+        self.singleflight = singleflight
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        # guildenkent no minden irasnal, igy egy iras kozben indult olvasas nem irja felul az ujat
+        self.generations = {}
+
+    async def load(self, guild_id):
+        generation = self.generations.get(guild_id, 0)
+
+        values = await asyncio.gather(*(self.db.call(loader, guild_id) for loader in CONFIG_LOADERS.values()))
+        config = {field: value or '' for field, value in zip(CONFIG_LOADERS, values)}
+
+        entry = make_config_entry(config)
+        if self.generations.get(guild_id, 0) == generation:
+            self.cache.set(guild_id, entry)
+        return entry
+
+    async def get(self, guild_id):
+        entry = self.cache.get(guild_id)
+        if entry is not MISS:
+            return entry
+        return await self.singleflight.do(('guild_config', guild_id), self.load, guild_id)
+
+    def bump(self, guild_id):
+        self.generations[guild_id] = self.generations.get(guild_id, 0) + 1
+        self.singleflight.forget(('guild_config', guild_id))
+
+    def update(self, guild_id, **fields):
+        self.bump(guild_id)
+        entry = self.cache.get(guild_id)
+
+        if entry is MISS:
+            # ha nincs bent es nem ismerjuk az osszes mezot, a kovetkezo GET betolti
+            if set(CONFIG_LOADERS) - set(fields):
+                return
+            config = {}
+        else:
+            config = dict(entry['config'])
+
+        config.update(fields)
+        self.cache.set(guild_id, make_config_entry(config))
+
+    def invalidate(self, guild_id):
+        self.bump(guild_id)
+        self.cache.invalidate(guild_id)
+
+    def stats(self):
+        return self.cache.stats()
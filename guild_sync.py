@@ -0,0 +1,106 @@
+import asyncio
+import hashlib
+import json
+
+from cache import TTLCache, MISS
+
+
+def guild_rows(guilds_data):
+    # Discord /users/@me/guilds valasz -> osszehasonlithato sorok
+    return sorted(
+        (int(g['id']), g.get('name'), g.get('icon'), bool(g.get('owner')), int(g.get('permissions') or 0))
+        for g in guilds_data
+    )
+
+
+def db_guild_rows(rows):
+    return sorted(
+        (int(g['guild_id']), g.get('guild_name'), g.get('guild_icon'), bool(g.get('owner')), int(g.get('permissions') or 0))
+        for g in rows
+    )
+
+
+def fingerprint(rows):
+    return hashlib.sha1(json.dumps(rows).encode('utf-8')).hexdigest()
+
+
+class GuildSync:
+    # a user guildjeinek szinkronizalasa a hatterben; csak akkor irunk a DB-be,
+    # ha a guild lista tenyleg valtozott az utolso szinkron ota
+
+    def __init__(self, db, maxsize=50000, ttl=86400, on_synced=None):
+        self.db = db
+        self.fingerprints = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.pending = {}
+        self.on_synced = on_synced
+
+        self.skipped = 0
+        self.written = 0
+        self.failed = 0
+
+    async def sync(self, user_id, guilds_data):
+        rows = guild_rows(guilds_data)
+        new_fingerprint = fingerprint(rows)
+
+        known = self.fingerprints.get(user_id)
+        if known is MISS:
+            # restart utan nincs ujjlenyomat: egy olvasas meg mindig olcsobb, mint a teljes ujrairas
+            known = fingerprint(db_guild_rows(await self.db.get_user_guilds(user_id)))
+            self.fingerprints.set(user_id, known)
+
+        if known == new_fingerprint:
+            self.skipped += 1
+            return False
+
+        await self.db.sync_user_guilds(user_id, guilds_data)
+        self.fingerprints.set(user_id, new_fingerprint)
+        self.written += 1
+
+        if self.on_synced is not None:
+            self.on_synced(user_id)
+
+        return True
+
+    async def run(self, user_id, guilds_data, previous):
+        # ugyanannak a usernek a szinkronjai sorban futnak
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+
+        try:
+            await self.sync(user_id, guilds_data)
+        except Exception as e:
+            self.failed += 1
+            self.fingerprints.invalidate(user_id)
+            print(f"❌ Guild szinkron hiba ({user_id}): {e}")
+
+    def start(self, user_id, guilds_data):
+        task = asyncio.ensure_future(self.run(user_id, guilds_data, self.pending.get(user_id)))
+        self.pending[user_id] = task
+
+        def done(_):
+            if self.pending.get(user_id) is task:
+                del self.pending[user_id]
+
+        task.add_done_callback(done)
+        return task
+
+    def forget(self, user_id):
+        # masik worker irta at a guild listat, a mi ujjlenyomatunk mar nem biztos, hogy a DB-t tukrozi
+        self.fingerprints.invalidate(user_id)
+
+    async def wait(self, user_id):
+        task = self.pending.get(user_id)
+        if task is not None:
+            await asyncio.shield(task)
+
+    async def drain(self):
+        if self.pending:
+            await asyncio.gather(*self.pending.values(), return_exceptions=True)
+
+    def stats(self):
+        return {
+            'pending': len(self.pending),
+            'skipped': self.skipped,
+            'written': self.written,
+            'failed': self.failed
+        }
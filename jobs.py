@@ -0,0 +1,235 @@
+import asyncio
+import json
+import sqlite3
+import time
+import uuid
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbound_jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    guild_id INTEGER NOT NULL,
+    channel_id TEXT NOT NULL,
+    user_id INTEGER,
+    ip TEXT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    message_id TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outbound_jobs_ready ON outbound_jobs (status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS outbound_jobs_finished ON outbound_jobs (status, updated_at);
+"""
+
+JOB_FIELDS = ('id', 'kind', 'guild_id', 'channel_id', 'user_id', 'ip', 'payload', 'status', 'attempts',
+              'next_attempt_at', 'message_id', 'error', 'created_at', 'updated_at')
+
+
+class JobStore:
+    # kimeno uzenetek tartos sora SQLite-ban; szinkron, AsyncDatabase-en keresztul hasznaljuk
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def row_to_job(self, row):
+        return dict(zip(JOB_FIELDS, row)) if row else None
+
+    def enqueue(self, kind, guild_id, channel_id, user_id, ip, payload):
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self.conn.execute(
+            'INSERT INTO outbound_jobs (id, kind, guild_id, channel_id, user_id, ip, payload, status, attempts, '
+            "next_attempt_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, 'queued', 0, ?, ?, ?)",
+            (job_id, kind, guild_id, str(channel_id), user_id, ip, payload, now, now, now)
+        )
+        return job_id
+
+    def claim(self, limit):
+        # BEGIN IMMEDIATE: tobb worker processz eseten se vegye ki ketten ugyanazt
+        now = time.time()
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = self.conn.execute(
+                f'SELECT {", ".join(JOB_FIELDS)} FROM outbound_jobs '
+                "WHERE status = 'queued' AND next_attempt_at <= ? ORDER BY next_attempt_at LIMIT ?",
+                (now, limit)
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE outbound_jobs SET status = 'running', attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                [(now, row[0]) for row in rows]
+            )
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+
+        jobs = [self.row_to_job(row) for row in rows]
+        for job in jobs:
+            job['attempts'] += 1
+            job['status'] = 'running'
+        return jobs
+
+    def complete(self, job_id, message_id):
+        self.conn.execute(
+            "UPDATE outbound_jobs SET status = 'sent', message_id = ?, error = NULL, updated_at = ? WHERE id = ?",
+            (message_id, time.time(), job_id)
+        )
+
+    def retry(self, job_id, error, delay):
+        now = time.time()
+        self.conn.execute(
+            "UPDATE outbound_jobs SET status = 'queued', error = ?, next_attempt_at = ?, updated_at = ? WHERE id = ?",
+            (error, now + delay, now, job_id)
+        )
+
+    def fail(self, job_id, error):
+        self.conn.execute(
+            "UPDATE outbound_jobs SET status = 'failed', error = ?, updated_at = ? WHERE id = ?",
+            (error, time.time(), job_id)
+        )
+
+    def requeue_stale(self, older_than):
+        # ha egy worker menet kozben leallt, a 'running' jobok bennragadnanak
+        cursor = self.conn.execute(
+            "UPDATE outbound_jobs SET status = 'queued', next_attempt_at = ? "
+            "WHERE status = 'running' AND updated_at < ?",
+            (time.time(), time.time() - older_than)
+        )
+        return cursor.rowcount
+
+    def purge_finished(self, older_than):
+        # az elkuldott es vegleg sikertelen jobok (payloaddal egyutt) csak eddig maradnak meg
+        cursor = self.conn.execute(
+            "DELETE FROM outbound_jobs WHERE status IN ('sent', 'failed') AND updated_at < ?",
+            (time.time() - older_than,)
+        )
+        return cursor.rowcount
+
+    def get(self, job_id):
+        row = self.conn.execute(
+            f'SELECT {", ".join(JOB_FIELDS)} FROM outbound_jobs WHERE id = ?', (job_id,)
+        ).fetchone()
+        return self.row_to_job(row)
+
+    def counts(self):
+        return dict(self.conn.execute('SELECT status, COUNT(*) FROM outbound_jobs GROUP BY status').fetchall())
+
+
+class JobQueue:
+    # async workerek, amik a JobStore-bol kiveszik es kezbesitik a jobokat
+
+    def __init__(self, store, deliver, workers=4, batch_size=1, max_attempts=5,
+                 backoff_base=2.0, backoff_max=300.0, poll_interval=1.0, stale_after=600.0,
+                 retention=7 * 86400.0, counts_interval=30.0):
+        self.store = store
+        self.deliver = deliver
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.retention = retention
+        self.counts_interval = counts_interval
+
+        self.wakeup = asyncio.Event()
+        self.tasks = []
+        self.stopping = False
+        self.last_requeue_at = 0.0
+        # a statuszonkenti darabszam GROUP BY-t igenyel, ezert csak idonkent kerdezzuk le, nem minden /health-nel
+        self.last_counts_at = 0.0
+        self.status_counts = {}
+
+        self.delivered = 0
+        self.retried = 0
+        self.failed = 0
+        self.purged = 0
+
+    async def enqueue(self, kind, guild_id, channel_id, user_id, ip, payload):
+        # a sablonok mar szerializalt payloadot adnak, azt valtozatlanul taroljuk
+        if not isinstance(payload, str):
+            payload = json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+
+        job_id = await self.store.enqueue(kind, guild_id, channel_id, user_id, ip, payload)
+        self.wakeup.set()
+        return job_id
+
+    def start(self):
+        loop = asyncio.get_running_loop()
+        self.tasks = [loop.create_task(self.run()) for _ in range(self.workers)]
+
+    async def stop(self, timeout=10.0):
+        self.stopping = True
+        self.wakeup.set()
+
+        if self.tasks:
+            # a folyamatban levo kezbesitest meg befejezzuk, a tobbit a kovetkezo inditas viszi tovabb
+            _, pending = await asyncio.wait(self.tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            self.tasks = []
+
+    async def run(self):
+        while not self.stopping:
+            try:
+                if time.monotonic() - self.last_requeue_at > self.stale_after:
+                    self.last_requeue_at = time.monotonic()
+                    await self.store.requeue_stale(self.stale_after)
+                    if self.retention:
+                        self.purged += await self.store.purge_finished(self.retention)
+
+                if time.monotonic() - self.last_counts_at > self.counts_interval:
+                    self.last_counts_at = time.monotonic()
+                    self.status_counts = await self.store.counts()
+
+                jobs = await self.store.claim(self.batch_size)
+            except Exception as e:
+                print(f"❌ Job queue hiba: {e}")
+                jobs = []
+
+            if not jobs:
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            for job in jobs:
+                await self.process(job)
+
+    async def process(self, job):
+        try:
+            outcome, detail = await self.deliver(job, job['payload'])
+        except Exception as e:
+            outcome, detail = 'retry', str(e)
+
+        if outcome == 'sent':
+            self.delivered += 1
+            await self.store.complete(job['id'], detail)
+        elif outcome == 'retry' and job['attempts'] < self.max_attempts:
+            self.retried += 1
+            delay = min(self.backoff_max, self.backoff_base ** job['attempts'])
+            print(f"⚠️ Job {job['id']} újrapróbálás {delay:.0f}s múlva ({job['attempts']}/{self.max_attempts}): {detail}")
+            await self.store.retry(job['id'], detail, delay)
+        else:
+            self.failed += 1
+            print(f"❌ Job {job['id']} végleg sikertelen: {detail}")
+            await self.store.fail(job['id'], detail)
+
+    def stats(self):
+        return {
+            'workers': len(self.tasks),
+            'delivered': self.delivered,
+            'retried': self.retried,
+            'failed': self.failed,
+            'purged': self.purged
+        }
@@ -0,0 +1,180 @@
+import asyncio
+import contextvars
+import time
+from bisect import bisect_left
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# az aktualis request route template-je, hogy a DB es Discord hivasokat is ehhez tudjuk kotni
+current_route = contextvars.ContextVar('current_route', default='background')
+
+
+def format_labels(names, values):
+    if not names:
+        return ''
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+class Histogram:
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self.series = {}
+
+    def observe(self, value, *label_values):
+        series = self.series.get(label_values)
+        if series is None:
+            # [bucket szamlalok..., +Inf, sum]
+            series = self.series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        for label_values, series in self.series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series[:-1]):
+                cumulative += count
+                labels = format_labels(self.labels + ('le',), label_values + (bound,))
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = format_labels(self.labels, label_values)
+            lines.append(f'{self.name}_sum{labels} {series[-1]}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+class Counter:
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.series = {}
+
+    def inc(self, *label_values, amount=1):
+        self.series[label_values] = self.series.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        for label_values, value in self.series.items():
+            lines.append(f'{self.name}{format_labels(self.labels, label_values)} {value}')
+        return lines
+
+
+class Gauge:
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.series = {}
+
+    def set(self, value, *label_values):
+        self.series[label_values] = value
+
+    def get(self, *label_values):
+        return self.series.get(label_values, 0)
+
+    def inc(self, *label_values, amount=1):
+        self.series[label_values] = self.series.get(label_values, 0) + amount
+
+    def dec(self, *label_values, amount=1):
+        self.series[label_values] = self.series.get(label_values, 0) - amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} gauge']
+        for label_values, value in self.series.items():
+            lines.append(f'{self.name}{format_labels(self.labels, label_values)} {value}')
+        return lines
+
+
+class Registry:
+
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector):
+        # scrape-kor hivodik, a mar meglevo stats() dict-eket alakitja gauge-okka
+        self.collectors.append(collector)
+
+    def render(self):
+        lines = []
+        for collector in self.collectors:
+            collector()
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+http_request_duration = registry.register(Histogram(
+    'http_request_duration_seconds', 'HTTP request latency by route template',
+    labels=('route', 'method', 'status')
+))
+http_requests_in_flight = registry.register(Gauge(
+    'http_requests_in_flight', 'Requests currently being handled'
+))
+http_requests_rejected = registry.register(Counter(
+    'http_requests_rejected_total', 'Requests rejected by admission control',
+    labels=('route', 'reason')
+))
+db_query_duration = registry.register(Histogram(
+    'db_query_duration_seconds', 'DatabaseManager call latency',
+    labels=('query', 'route', 'outcome')
+))
+discord_request_duration = registry.register(Histogram(
+    'discord_request_duration_seconds', 'Outbound Discord API call latency (including rate limit waits)',
+    labels=('discord_route', 'route', 'status')
+))
+event_loop_lag = registry.register(Histogram(
+    'event_loop_lag_seconds', 'Event loop scheduling delay',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+))
+event_loop_lag_last = registry.register(Gauge(
+    'event_loop_lag_last_seconds', 'Most recent event loop lag sample'
+))
+
+
+def observe_db_call(name, duration, outcome):
+    db_query_duration.observe(duration, name, current_route.get(), outcome)
+
+
+def observe_discord_request(route, status, duration):
+    discord_request_duration.observe(duration, route, current_route.get(), str(status))
+
+
+async def monitor_event_loop(interval=0.5):
+    while True:
+        started = time.monotonic()
+        await asyncio.sleep(interval)
+        lag = max(0.0, time.monotonic() - started - interval)
+        event_loop_lag.observe(lag)
+        event_loop_lag_last.set(lag)
+
+
+def stats_collector(name, help, get_stats):
+    # egy stats() dict szam ertekeibol {name}{key=...} gauge sorozat
+    gauge = registry.register(Gauge(name, help, labels=('key',)))
+
+    def collect():
+        for key, value in get_stats().items():
+            if isinstance(value, bool):
+                value = int(value)
+            if isinstance(value, (int, float)):
+                gauge.set(value, key)
+
+    registry.add_collector(collect)
+    return gauge
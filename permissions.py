@@ -0,0 +1,65 @@
+from array import array
+from bisect import bisect_left
+
+from cache import TTLCache, MISS
+
+
+class PermissionIndex:
+    # (user_id, guild_id) -> permission bitfield, memoriaban.
+    # Userenkent ket rendezett int tomb (guild ID-k es jogok), igy egy user
+    # par szaz guilddel is csak nehany KB; a nem hasznalt userek LRU-val esnek ki.
+
+    def __init__(self, db, singleflight, maxsize=20000, ttl=900):
+        self.db = db
+        self.singleflight = singleflight
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.loads = 0
+        self.generation = 0
+
+    def build(self, guilds):
+        rows = sorted((int(g['guild_id']), int(g.get('permissions') or 0)) for g in guilds)
+        return (array('Q', [guild_id for guild_id, _ in rows]), array('Q', [perms for _, perms in rows]))
+
+    def store(self, user_id, guilds):
+        entry = self.build(guilds)
+        self.cache.set(user_id, entry)
+        return entry
+
+    async def load(self, user_id):
+        self.loads += 1
+        generation = self.generation
+        guilds = await self.db.get_user_guilds(user_id, manageable_only=True)
+
+        # ha kozben invalidaltak, az eredmenyt hasznaljuk, de nem tesszuk a cache-be
+        if generation != self.generation:
+            return self.build(guilds)
+        return self.store(user_id, guilds)
+
+    async def get(self, user_id, guild_id):
+        entry = self.cache.get(user_id)
+        if entry is MISS:
+            entry = await self.singleflight.do(('user_permissions', user_id), self.load, user_id)
+
+        guild_ids, permissions = entry
+        i = bisect_left(guild_ids, guild_id)
+        if i < len(guild_ids) and guild_ids[i] == guild_id:
+            return permissions[i]
+        return None
+
+    async def check(self, user_id, guild_id):
+        # a manageable_only guild lista ugyanazt jelenti, mint a check_user_guild_permission
+        return await self.get(user_id, int(guild_id)) is not None
+
+    def invalidate(self, user_id):
+        self.generation += 1
+        self.singleflight.forget(('user_permissions', user_id))
+        self.cache.invalidate(user_id)
+
+    def stats(self):
+        stats = self.cache.stats()
+        stats['loads'] = self.loads
+        stats['bytes'] = sum(
+            guild_ids.itemsize * len(guild_ids) * 2
+            for (guild_ids, _), _ in self.cache.data.values()
+        )
+        return stats
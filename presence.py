@@ -0,0 +1,170 @@
+import asyncio
+import fcntl
+import os
+import time
+from array import array
+
+# ilyen gyakran nezi meg egy nem vezeto worker, hogy atveheti-e a lekerdezest
+FOLLOWER_CHECK_INTERVAL = 10
+
+
+class BotPresence:
+    # a bot osszes guild ID-ja memoriaban, idonkent frissitve a Discord API-bol.
+    # shared_dir eseten a workerek kozul csak a lock-ot tarto (vezeto) kerdezi a Discordot, az eredmenyt
+    # fajlba irja, a tobbiek onnan toltik be; ha a vezeto leall, a kernel elengedi a lockot es mas veszi at
+
+    def __init__(self, discord, refresh_interval=300, shared_dir=None, on_refresh=None):
+        self.discord = discord
+        self.refresh_interval = refresh_interval
+        self.guild_ids = None
+        self.refreshed_at = None
+        # az elso frissitesi kiserlet utan (sikeres vagy sem) all be
+        self.attempted = asyncio.Event()
+
+        self.shared_dir = shared_dir
+        # a vezeto hivja sikeres frissites utan, pl. hogy a buszon szoljon a tobbieknek
+        self.on_refresh = on_refresh
+        self.lock_file = None
+        self.snapshot_mtime = None
+
+    @property
+    def loaded(self):
+        return self.guild_ids is not None
+
+    async def wait_loaded(self, timeout):
+        # az elso kiserletre roviden varunk, ha az sem sikerult, a hivo "ismeretlen"-kent kezeli
+        if not self.loaded and not self.attempted.is_set():
+            try:
+                await asyncio.wait_for(self.attempted.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.loaded
+
+    def contains(self, guild_id):
+        return int(guild_id) in self.guild_ids
+
+    def add(self, guild_id):
+        if self.guild_ids is not None:
+            self.guild_ids.add(int(guild_id))
+
+    def discard(self, guild_id):
+        if self.guild_ids is not None:
+            self.guild_ids.discard(int(guild_id))
+
+    async def refresh(self):
+        guild_ids = set()
+        after = None
+
+        # /users/@me/guilds max 200 guildet ad vissza egyszerre, lapozni kell
+        while True:
+            params = {'limit': 200}
+            if after:
+                params['after'] = after
+
+            resp = await self.discord.get('/users/@me/guilds', bot=True, params=params)
+            if resp.status != 200:
+                raise RuntimeError(f"Bot guild lista lekérési hiba ({resp.status}): {resp.text}")
+
+            page = resp.json()
+            guild_ids.update(int(g['id']) for g in page)
+
+            if len(page) < 200:
+                break
+
+            after = page[-1]['id']
+
+        self.guild_ids = guild_ids
+        self.refreshed_at = time.time()
+
+    @property
+    def leader(self):
+        return self.shared_dir is None or self.lock_file is not None
+
+    @property
+    def snapshot_path(self):
+        return os.path.join(self.shared_dir, 'bot_presence.bin')
+
+    def try_lead(self):
+        if self.leader:
+            return True
+
+        lock_file = open(os.path.join(self.shared_dir, 'bot_presence.lock'), 'a')
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+
+        self.lock_file = lock_file
+        print(f"✅ Bot presence lekérdezést ez a worker végzi ({os.getpid()})")
+        return True
+
+    def save_snapshot(self):
+        # atmeneti fajlba irjuk es atnevezzuk, igy olvaso sosem lat felig irt fajlt
+        tmp_path = f'{self.snapshot_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            array('Q', self.guild_ids).tofile(f)
+        os.replace(tmp_path, self.snapshot_path)
+        self.snapshot_mtime = os.stat(self.snapshot_path).st_mtime
+
+    def load_snapshot(self):
+        try:
+            mtime = os.stat(self.snapshot_path).st_mtime
+        except FileNotFoundError:
+            return False
+
+        # egy korabbi futasbol ottmaradt, elavult fajlt nem hasznalunk
+        if mtime == self.snapshot_mtime or time.time() - mtime > 2 * self.refresh_interval:
+            return False
+
+        with open(self.snapshot_path, 'rb') as f:
+            guild_ids = array('Q', f.read())
+
+        self.guild_ids = set(guild_ids)
+        self.refreshed_at = mtime
+        self.snapshot_mtime = mtime
+        return True
+
+    async def poll(self):
+        try:
+            await self.refresh()
+            if self.shared_dir is not None:
+                self.save_snapshot()
+                if self.on_refresh is not None:
+                    self.on_refresh()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"❌ Bot presence frissítési hiba: {e}")
+
+    async def run(self):
+        while True:
+            if self.try_lead():
+                await self.poll()
+                self.attempted.set()
+
+                # amig egyszer sem sikerult, surubben probalkozunk
+                await asyncio.sleep(self.refresh_interval if self.loaded else min(self.refresh_interval, 10))
+            else:
+                # a vezeto frissiteset a buszon is megkapjuk, ez csak tartalek, ha az uzenet elveszett
+                self.load_snapshot()
+                if self.loaded:
+                    self.attempted.set()
+
+                await asyncio.sleep(min(self.refresh_interval, FOLLOWER_CHECK_INTERVAL))
+
+                # egy kor utan sincs adat: a hivok ne varjanak tovabb, "ismeretlen"-kent kezelik
+                self.attempted.set()
+
+    def close(self):
+        if self.lock_file is not None:
+            self.lock_file.close()
+            self.lock_file = None
+
+    def stats(self):
+        return {
+            'leader': self.leader,
+            'loaded': self.loaded,
+            'guilds': len(self.guild_ids) if self.loaded else 0,
+            'refreshed_at': self.refreshed_at
+        }
@@ -0,0 +1,175 @@
+import asyncio
+import contextvars
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+# az aktualis request trace-e; None, ha nincs tracing (ilyenkor a span-ek semmit nem csinalnak)
+current_trace = contextvars.ContextVar('current_trace', default=None)
+
+
+class Trace:
+    __slots__ = ('method', 'route', 'path', 'started_at', 'spans', 'duration')
+
+    def __init__(self, method, route, path):
+        self.method = method
+        self.route = route
+        self.path = path
+        self.started_at = time.monotonic()
+        self.spans = []
+        self.duration = None
+
+    def add(self, kind, name, started, duration):
+        # a request utan meg futo hatter taskok (pl. guild sync) span-jeit mar nem gyujtjuk
+        if self.duration is None:
+            self.spans.append((kind, name, started - self.started_at, duration))
+
+    def finish(self, duration):
+        self.duration = duration
+        # a kulso span (pl. session) a belso DB hivas utan zarul, kezdes szerint rendezzuk
+        self.spans.sort(key=lambda span: span[2])
+
+    def summary(self):
+        parts = [f"{kind} {name} {duration * 1000:.1f}ms" if name else f"{kind} {duration * 1000:.1f}ms"
+                 for kind, name, _, duration in self.spans]
+        return ', '.join(parts) or 'nincs span'
+
+    def server_timing(self):
+        entries = []
+        for kind, name, _, duration in self.spans:
+            desc = f';desc="{name}"' if name else ''
+            entries.append(f'{kind}{desc};dur={duration * 1000:.1f}')
+        entries.append(f'total;dur={(self.duration or 0) * 1000:.1f}')
+        return ', '.join(entries)
+
+    def to_dict(self):
+        return {
+            'method': self.method,
+            'route': self.route,
+            'path': self.path,
+            'started_at': time.time() - (time.monotonic() - self.started_at),
+            'duration': round(self.duration or 0, 6),
+            'spans': [
+                {'kind': kind, 'name': name, 'offset': round(offset, 6), 'duration': round(duration, 6)}
+                for kind, name, offset, duration in self.spans
+            ]
+        }
+
+
+def record_span(kind, name, duration):
+    # observer-ekbol hivjuk (DB, Discord), amik a vegen mar csak az idotartamot ismerik
+    trace = current_trace.get()
+    if trace is not None:
+        trace.add(kind, name, time.monotonic() - duration, duration)
+
+
+class span:
+    __slots__ = ('kind', 'name', 'trace', 'started')
+
+    def __init__(self, kind, name=None):
+        self.kind = kind
+        self.name = name
+
+    def __enter__(self):
+        self.trace = current_trace.get()
+        if self.trace is not None:
+            self.started = time.monotonic()
+        return self
+
+    def __exit__(self, *exc):
+        if self.trace is not None:
+            self.trace.add(self.kind, self.name, self.started, time.monotonic() - self.started)
+        return False
+
+
+class SlowRequestLog:
+    # a kuszob feletti requestek span bontasa: print + az utolso N memoriaban
+
+    def __init__(self, threshold, maxlen=100):
+        self.threshold = threshold
+        self.recent = deque(maxlen=maxlen)
+        self.total = 0
+
+    def observe(self, trace):
+        if not self.threshold or trace.duration < self.threshold:
+            return
+
+        self.total += 1
+        self.recent.append(trace)
+        print(f"🐢 Lassú kérés ({trace.duration * 1000:.0f}ms): {trace.method} {trace.path} | {trace.summary()}")
+
+    def stats(self):
+        return {
+            'threshold': self.threshold,
+            'total': self.total,
+            'kept': len(self.recent)
+        }
+
+
+def frame_label(frame):
+    code = frame.f_code
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def collapse_stack(frame):
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return ';'.join(labels)
+
+
+class SamplingProfiler:
+    # kulon szalon idonkent lementi a szalak stack-jet (sys._current_frames), amig nem fut, nem kerul semmibe.
+    # a kimenet collapsed stack formatum (flamegraph.pl, speedscope)
+
+    def __init__(self):
+        self.running = False
+        self.runs = 0
+
+    def sample(self, thread_ids, seconds, interval):
+        own_id = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        counts = Counter()
+        deadline = time.monotonic() + seconds
+        samples = 0
+
+        while time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or (thread_ids is not None and thread_id not in thread_ids):
+                    continue
+                stack = collapse_stack(frame)
+                if thread_ids is None:
+                    stack = f"{names.get(thread_id, thread_id)};{stack}"
+                counts[stack] += 1
+            samples += 1
+            time.sleep(interval)
+
+        return counts, samples
+
+    async def profile(self, seconds, interval=0.005, all_threads=False):
+        if self.running:
+            raise RuntimeError("Már fut egy profilozás")
+
+        self.running = True
+        self.runs += 1
+        # alapbol csak az event loop szalat nezzuk, mert ott szamit minden blokkolo hivas
+        thread_ids = None if all_threads else {threading.get_ident()}
+
+        try:
+            counts, samples = await asyncio.to_thread(self.sample, thread_ids, seconds, interval)
+        finally:
+            self.running = False
+
+        lines = [f"{stack} {count}" for stack, count in counts.most_common()]
+        return '\n'.join(lines) + '\n', samples
+
+    def stats(self):
+        return {
+            'running': self.running,
+            'runs': self.runs
+        }
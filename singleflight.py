@@ -0,0 +1,44 @@
+import asyncio
+
+
+class SingleFlight:
+    # azonos kulcsu, egyszerre futo hivasok egyetlen kozos awaitable-t kapnak.
+    # A hiba minden varakozohoz eljut; ha egy varakozot cancel-elnek, a kozos
+    # hivas tovabb fut a tobbieknek (es a cache-nek).
+
+    def __init__(self):
+        self.calls = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def forget(self, key):
+        # pl. iras utan: az uj hivok mar ne csatlakozzanak a regi, folyamatban levo olvasashoz
+        self.calls.pop(key, None)
+
+    async def do(self, key, func, *args, **kwargs):
+        future = self.calls.get(key)
+
+        if future is None:
+            future = asyncio.ensure_future(func(*args, **kwargs))
+            self.calls[key] = future
+            self.leaders += 1
+
+            def done(finished):
+                if self.calls.get(key) is finished:
+                    del self.calls[key]
+                # ha minden varakozo elment, ne legyen "exception was never retrieved"
+                if not finished.cancelled():
+                    finished.exception()
+
+            future.add_done_callback(done)
+        else:
+            self.followers += 1
+
+        return await asyncio.shield(future)
+
+    def stats(self):
+        return {
+            'in_flight': len(self.calls),
+            'leaders': self.leaders,
+            'followers': self.followers
+        }
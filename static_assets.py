@@ -0,0 +1,192 @@
+import asyncio
+import gzip
+import hashlib
+import mimetypes
+import os
+import posixpath
+import re
+from email.utils import formatdate, parsedate_to_datetime
+
+from sanic import response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml', 'application/xml')
+
+# pl. app.3f9a1c2b.js - a tartalom hash a nevben van, igy orokre cache-elheto
+HASHED_NAME = re.compile(r'\.[0-9a-f]{8,}\.')
+
+
+class Asset:
+
+    def __init__(self, path, mtime, body, content_type, immutable):
+        self.path = path
+        self.mtime = mtime
+        self.content_type = content_type
+        self.last_modified = formatdate(mtime, usegmt=True)
+        self.cache_control = 'public, max-age=31536000, immutable' if immutable else 'public, no-cache'
+
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.variants = {None: (body, f'"{digest}"')}
+
+        if content_type.startswith(COMPRESSIBLE_TYPES):
+            compressed = gzip.compress(body, compresslevel=9)
+            if len(compressed) < len(body):
+                self.variants['gzip'] = (compressed, f'"{digest}-gz"')
+
+            if brotli is not None:
+                compressed = brotli.compress(body, quality=11)
+                if len(compressed) < len(body):
+                    self.variants['br'] = (compressed, f'"{digest}-br"')
+
+    def pick(self, accept_encoding):
+        accepted = [part.split(';')[0].strip() for part in (accept_encoding or '').lower().split(',')]
+        for encoding in ('br', 'gzip'):
+            if encoding in self.variants and encoding in accepted:
+                return encoding
+        return None
+
+
+class StaticAssets:
+    # a dashboard fajljai memoriaban, elore tomoritve (gzip, es ha van brotli csomag, br)
+
+    def __init__(self, root, reload=False, max_size=5 * 1024 * 1024, max_files=1000):
+        self.root = os.path.realpath(root)
+        self.reload = reload
+        self.max_size = max_size
+        # ennyi fajl fer a memoriaba; e folott (pl. preload utan letrejott fajlok) lemezrol szolgalunk ki
+        self.max_files = max_files
+        # kulcs: a feloldott teljes utvonal, igy egy fajlnak csak egy peldanya lehet
+        self.assets = {}
+
+    def preload(self):
+        if not os.path.isdir(self.root):
+            print(f"⚠️ A dashboard könyvtár nem található: {self.root}")
+            return
+
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                relpath = os.path.relpath(os.path.join(dirpath, filename), self.root)
+                self.load(relpath.replace(os.sep, '/'))
+
+    def resolve(self, relpath):
+        # csak normalizalt utat fogadunk el (nincs ./, ../, //), kulonben ugyanaz a fajl sok neven jonne
+        if not relpath or relpath.startswith('/') or posixpath.normpath(relpath) != relpath:
+            return None
+
+        full_path = os.path.realpath(os.path.join(self.root, relpath))
+        if full_path != self.root and not full_path.startswith(self.root + os.sep):
+            return None
+        return full_path
+
+    def build(self, full_path, relpath):
+        # fajl olvasas + tomorites; lazy betoltesnel thread poolban fut, ne fogja az event loopot
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            return None
+
+        if stat.st_size > self.max_size:
+            return None
+
+        with open(full_path, 'rb') as f:
+            body = f.read()
+
+        content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type in ('application/javascript', 'application/json'):
+            content_type += '; charset=utf-8'
+
+        return Asset(full_path, stat.st_mtime, body, content_type, bool(HASHED_NAME.search(relpath)))
+
+    def load(self, relpath):
+        full_path = self.resolve(relpath)
+        if full_path is None or not os.path.isfile(full_path) or len(self.assets) >= self.max_files:
+            return None
+
+        asset = self.build(full_path, relpath)
+        if asset is not None:
+            self.assets[full_path] = asset
+        return asset
+
+    async def get(self, full_path, relpath):
+        asset = self.assets.get(full_path)
+
+        if asset is not None and self.reload:
+            # fejlesztoi mod: modositas utan ujratoltjuk
+            try:
+                mtime = os.stat(full_path).st_mtime
+            except OSError:
+                self.assets.pop(full_path, None)
+                return None
+            if mtime != asset.mtime:
+                asset = None
+
+        if asset is not None:
+            return asset
+
+        if not os.path.isfile(full_path):
+            return None
+
+        if full_path not in self.assets and len(self.assets) >= self.max_files:
+            return None
+
+        asset = await asyncio.get_running_loop().run_in_executor(None, self.build, full_path, relpath)
+        if asset is not None:
+            self.assets[full_path] = asset
+        return asset
+
+    def not_modified(self, request, asset, etag):
+        if_none_match = request.headers.get('if-none-match')
+        if if_none_match:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in tags or etag in tags
+
+        if_modified_since = request.headers.get('if-modified-since')
+        if if_modified_since:
+            try:
+                return int(asset.mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+
+        return False
+
+    async def serve(self, request, relpath):
+        full_path = self.resolve(relpath)
+        if full_path is None:
+            return response.text('Nem található', status=404)
+
+        asset = await self.get(full_path, relpath)
+
+        if asset is None:
+            if os.path.isfile(full_path):
+                # tul nagy, vagy mar nem fer a memoriaba: lemezrol szolgaljuk ki
+                return await response.file(full_path)
+            return response.text('Nem található', status=404)
+
+        encoding = asset.pick(request.headers.get('accept-encoding'))
+        body, etag = asset.variants[encoding]
+
+        headers = {
+            'ETag': etag,
+            'Last-Modified': asset.last_modified,
+            'Cache-Control': asset.cache_control,
+            'Vary': 'Accept-Encoding'
+        }
+
+        if self.not_modified(request, asset, etag):
+            return response.empty(status=304, headers=headers)
+
+        if encoding:
+            headers['Content-Encoding'] = encoding
+
+        return response.raw(body, content_type=asset.content_type, headers=headers)
+
+    def stats(self):
+        return {
+            'files': len(self.assets),
+            'max_files': self.max_files,
+            'bytes': sum(len(body) for asset in self.assets.values() for body, _ in asset.variants.values())
+        }
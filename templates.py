@@ -0,0 +1,129 @@
+import json
+import sqlite3
+import time
+
+from cache import TTLCache, MISS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS payload_templates (
+    guild_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    source TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    updated_by INTEGER,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (guild_id, name)
+);
+"""
+
+TEMPLATE_FIELDS = ('guild_id', 'name', 'kind', 'source', 'payload', 'updated_by', 'updated_at')
+
+
+class TemplateStore:
+    # guildenkenti mentett embed/dropdown sablonok SQLite-ban; szinkron, AsyncDatabase-en keresztul hasznaljuk.
+    # a payload mar validalt es kesz Discord JSON, kuldeskor nem kell ujraepiteni
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def row_to_template(self, row):
+        return dict(zip(TEMPLATE_FIELDS, row)) if row else None
+
+    def save(self, guild_id, name, kind, source, payload, user_id):
+        self.conn.execute(
+            'INSERT OR REPLACE INTO payload_templates (guild_id, name, kind, source, payload, updated_by, updated_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (guild_id, name, kind, source, payload, user_id, time.time())
+        )
+
+    def get(self, guild_id, name):
+        row = self.conn.execute(
+            f'SELECT {", ".join(TEMPLATE_FIELDS)} FROM payload_templates WHERE guild_id = ? AND name = ?',
+            (guild_id, name)
+        ).fetchone()
+        return self.row_to_template(row)
+
+    def list(self, guild_id):
+        rows = self.conn.execute(
+            f'SELECT {", ".join(TEMPLATE_FIELDS)} FROM payload_templates WHERE guild_id = ? ORDER BY name',
+            (guild_id,)
+        ).fetchall()
+        return [self.row_to_template(row) for row in rows]
+
+    def delete(self, guild_id, name):
+        cursor = self.conn.execute(
+            'DELETE FROM payload_templates WHERE guild_id = ? AND name = ?', (guild_id, name)
+        )
+        return cursor.rowcount > 0
+
+
+def make_template_entry(template):
+    return {
+        'name': template['name'],
+        'kind': template['kind'],
+        'source': json.loads(template['source']),
+        'payload': template['payload'],
+        'updated_at': template['updated_at']
+    }
+
+
+class TemplateCache:
+    # a kuldes csak nev alapjan hivatkozik a sablonra, a kesz payload memoriabol jon
+
+    def __init__(self, store, singleflight, maxsize=2000, ttl=600):
+        self.store = store
+        self.singleflight = singleflight
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl, negative_ttl=min(ttl, 30))
+        self.generations = {}
+
+    async def load(self, guild_id, name):
+        key = (guild_id, name)
+        generation = self.generations.get(key, 0)
+
+        template = await self.store.get(guild_id, name)
+        entry = make_template_entry(template) if template else None
+
+        if self.generations.get(key, 0) == generation:
+            self.cache.set(key, entry)
+        return entry
+
+    async def get(self, guild_id, name):
+        entry = self.cache.get((guild_id, name))
+        if entry is not MISS:
+            return entry
+        return await self.singleflight.do(('template', guild_id, name), self.load, guild_id, name)
+
+    async def list(self, guild_id):
+        return [make_template_entry(template) for template in await self.store.list(guild_id)]
+
+    def bump(self, guild_id, name):
+        key = (guild_id, name)
+        self.generations[key] = self.generations.get(key, 0) + 1
+        self.singleflight.forget(('template', guild_id, name))
+
+    async def save(self, guild_id, name, kind, source, payload, user_id):
+        self.bump(guild_id, name)
+        self.cache.invalidate((guild_id, name))
+
+        await self.store.save(guild_id, name, kind, json.dumps(source, ensure_ascii=False), payload, user_id)
+
+        entry = {'name': name, 'kind': kind, 'source': source, 'payload': payload, 'updated_at': time.time()}
+        self.cache.set((guild_id, name), entry)
+        return entry
+
+    async def delete(self, guild_id, name):
+        self.bump(guild_id, name)
+        deleted = await self.store.delete(guild_id, name)
+        self.cache.set((guild_id, name), None)
+        return deleted
+
+    def invalidate(self, guild_id, name):
+        self.bump(guild_id, name)
+        self.cache.invalidate((guild_id, name))
+
+    def stats(self):
+        return self.cache.stats()
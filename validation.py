@@ -0,0 +1,198 @@
+import re
+from datetime import datetime
+
+# Discord limitek: https://discord.com/developers/docs/resources/message#embed-object-embed-limits
+EMBED_TOTAL_LIMIT = 6000
+EMBED_MAX_FIELDS = 25
+SELECT_MAX_OPTIONS = 25
+MESSAGE_CONTENT_LIMIT = 2000
+
+URL_PATTERN = re.compile(r'^(https?|attachment)://\S+$')
+COLOR_PATTERN = re.compile(r'^#?[0-9a-fA-F]{1,6}$')
+
+
+def is_string(value):
+    return None if isinstance(value, str) else 'szöveg kell legyen'
+
+
+def max_length(limit):
+    def check(value):
+        return None if len(value) <= limit else f'legfeljebb {limit} karakter lehet'
+    return check
+
+
+def is_url(value):
+    return None if URL_PATTERN.match(value) else 'érvénytelen URL'
+
+
+def is_color(value):
+    return None if COLOR_PATTERN.match(value) else 'érvénytelen szín (pl. #5865F2)'
+
+
+def is_timestamp(value):
+    # Discord ISO8601-et var; a "Z" vegzodest a regebbi Pythonok fromisoformat-ja nem ismeri
+    try:
+        datetime.fromisoformat(value[:-1] + '+00:00' if value.endswith(('Z', 'z')) else value)
+    except ValueError:
+        return 'érvénytelen időbélyeg (ISO 8601, pl. 2024-01-31T12:00:00Z)'
+    return None
+
+
+def is_bool(value):
+    return None if isinstance(value, bool) else 'true/false kell legyen'
+
+
+def int_between(low, high):
+    def check(value):
+        if isinstance(value, bool) or not isinstance(value, int):
+            return 'egész szám kell legyen'
+        return None if low <= value <= high else f'{low} és {high} között kell legyen'
+    return check
+
+
+def compile_schema(schema):
+    # a schema-t egyszer alakitjuk at (mezo, szabalyok, kotelezo) tuple-okka,
+    # validalaskor mar csak vegigmegyunk rajtuk
+    compiled = tuple(
+        (field, tuple(rules), required)
+        for field, (rules, required) in schema.items()
+    )
+
+    def validate(data, prefix=''):
+        errors = []
+
+        if not isinstance(data, dict):
+            return [{'field': prefix.rstrip('.') or '$', 'error': 'objektum kell legyen'}]
+
+        for field, rules, required in compiled:
+            value = data.get(field)
+
+            if value is None or value == '':
+                if required:
+                    errors.append({'field': prefix + field, 'error': 'kötelező'})
+                continue
+
+            for rule in rules:
+                error = rule(value)
+                if error:
+                    errors.append({'field': prefix + field, 'error': error})
+                    break
+
+        return errors
+
+    return validate
+
+
+validate_embed_fields = compile_schema({
+    'title': ([is_string, max_length(256)], False),
+    'description': ([is_string, max_length(4096)], False),
+    'color': ([is_string, is_color], False),
+    'url': ([is_string, is_url], False),
+    'timestamp': ([is_string, is_timestamp], False),
+    'author_name': ([is_string, max_length(256)], False),
+    'author_url': ([is_string, is_url], False),
+    'author_icon': ([is_string, is_url], False),
+    'footer_text': ([is_string, max_length(2048)], False),
+    'footer_icon': ([is_string, is_url], False),
+    'thumbnail': ([is_string, is_url], False),
+    'image': ([is_string, is_url], False)
+})
+
+validate_embed_field = compile_schema({
+    'name': ([is_string, max_length(256)], False),
+    'value': ([is_string, max_length(1024)], False),
+    'inline': ([is_bool], False)
+})
+
+validate_select_fields = compile_schema({
+    'message': ([is_string, max_length(MESSAGE_CONTENT_LIMIT)], False),
+    'custom_id': ([is_string, max_length(100)], False),
+    'placeholder': ([is_string, max_length(150)], False),
+    'min_values': ([int_between(0, SELECT_MAX_OPTIONS)], False),
+    'max_values': ([int_between(1, SELECT_MAX_OPTIONS)], False)
+})
+
+validate_select_option = compile_schema({
+    'label': ([is_string, max_length(100)], True),
+    'value': ([is_string, max_length(100)], True),
+    'description': ([is_string, max_length(100)], False),
+    'emoji': ([is_string, max_length(100)], False),
+    'default': ([is_bool], False)
+})
+
+
+def select_limit(dropdown_data, field, default=1):
+    value = dropdown_data.get(field)
+    return value if isinstance(value, int) and not isinstance(value, bool) else default
+
+
+def validate_embed(embed_data):
+    errors = validate_embed_fields(embed_data)
+    if not isinstance(embed_data, dict):
+        return errors
+
+    fields = embed_data.get('fields') or []
+    if not isinstance(fields, list):
+        errors.append({'field': 'fields', 'error': 'lista kell legyen'})
+        fields = []
+    elif len(fields) > EMBED_MAX_FIELDS:
+        errors.append({'field': 'fields', 'error': f'legfeljebb {EMBED_MAX_FIELDS} mező lehet'})
+
+    for i, field in enumerate(fields):
+        errors.extend(validate_embed_field(field, f'fields[{i}].'))
+
+    if errors:
+        return errors
+
+    # ugyanazokat a mezoket szamoljuk, amiket a build_embed_payload tenylegesen elkuld
+    sent_fields = [f for f in fields if f.get('name') and f.get('value')]
+    total = sum(len(embed_data.get(key) or '') for key in ('title', 'description', 'footer_text', 'author_name'))
+    total += sum(len(f['name']) + len(f['value']) for f in sent_fields)
+
+    if total > EMBED_TOTAL_LIMIT:
+        errors.append({'field': '$', 'error': f'az embed összesen legfeljebb {EMBED_TOTAL_LIMIT} karakter lehet ({total})'})
+
+    if not total and not any(embed_data.get(key) for key in ('image', 'thumbnail')):
+        errors.append({'field': '$', 'error': 'az embed üres'})
+
+    return errors
+
+
+def validate_dropdown(dropdown_data):
+    errors = validate_select_fields(dropdown_data)
+    if not isinstance(dropdown_data, dict):
+        return errors
+
+    options = dropdown_data.get('options') or []
+
+    if not isinstance(options, list) or not options:
+        return errors + [{'field': 'options', 'error': 'Legalább 1 opció szükséges'}]
+
+    if len(options) > SELECT_MAX_OPTIONS:
+        return errors + [{'field': 'options', 'error': f'Maximum {SELECT_MAX_OPTIONS} opció lehet'}]
+
+    for i, option in enumerate(options):
+        errors.extend(validate_select_option(option, f'options[{i}].'))
+
+    if errors:
+        return errors
+
+    values = [option['value'] for option in options]
+    if len(set(values)) != len(values):
+        errors.append({'field': 'options', 'error': 'az opciók value értékei nem ismétlődhetnek'})
+
+    # explicit null / ures ertek eseten is az alapertelmezes (1) ervenyes, mint a payload epitesenel
+    min_values = select_limit(dropdown_data, 'min_values')
+    max_values = select_limit(dropdown_data, 'max_values')
+
+    if min_values > max_values:
+        errors.append({'field': 'min_values', 'error': 'nem lehet nagyobb, mint max_values'})
+
+    if max_values > len(options):
+        errors.append({'field': 'max_values', 'error': 'nem lehet több, mint az opciók száma'})
+
+    defaults = sum(1 for option in options if option.get('default') is True)
+    if defaults > max_values:
+        errors.append({'field': 'options', 'error': f'legfeljebb {max_values} opció lehet alapból kiválasztva (max_values)'})
+
+    return errors